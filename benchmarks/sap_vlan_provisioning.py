@@ -0,0 +1,88 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of provisioning the VLANs of SAPs in NetBox per VLAN and in compact mode.
+
+Provisions an L2VPN with trunk SAPs on a fake NetBox with the same NetBox calls as the create workflows of the
+products with SAPs, and compares the number of created objects, the number of requests and the wall-clock time of
+both ``NETBOX_SAP_VLAN_MODES``. Run with ``python -m benchmarks.sap_vlan_provisioning``.
+"""
+
+import argparse
+from time import perf_counter
+
+from nwastdlib.vlans import VlanRanges
+from products.services.netbox.payload.sap import build_vlan_payloads
+from services import netbox
+from services.netbox_metrics import registry
+from utils.fake_netbox import FakeNetbox
+
+
+def count_requests() -> int:
+    return int(
+        sum(
+            sample.value
+            for metric in registry.collect()
+            for sample in metric.samples
+            if sample.name == "orchestrator_netbox_requests_total"
+        )
+    )
+
+
+def provision(vlans: VlanRanges, saps: int, mode: str, run: int) -> None:
+    """Provision saps SAPs with vlans on their own VLAN group, an L2VPN and its terminations."""
+    group_ids = []
+    for sap in range(saps):
+        name = f"{mode} {run} node{sap:02} 0/0/1"
+        slug = name.replace(" ", "-").replace("/", "-")
+        group_id = netbox.create(netbox.VlanGroupPayload(name=name, slug=slug, vid_ranges=vlans.to_list_of_tuples()))
+        if vlan_payloads := build_vlan_payloads(name, group_id, vlans, mode):
+            netbox.create(netbox.VlansPayload(vlans=vlan_payloads))
+        group_ids.append(group_id)
+
+    l2vpn_id = netbox.create(netbox.L2vpnPayload(name=f"{mode} {run} l2vpn", slug=f"{mode}-{run}-l2vpn"))
+    terminations = [
+        netbox.L2vpnTerminationPayload(l2vpn=l2vpn_id, assigned_object_id=vlan.id)
+        for vlan in netbox.materialise_vlans(group_ids)
+    ]
+    netbox.bulk_create(terminations)
+
+    # the tagged VLANs of the ports are looked up when the ports are updated
+    for group_id in group_ids:
+        netbox.materialise_vlans([group_id])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vlans", default="2-1001", help="VLAN ranges of every SAP")
+    parser.add_argument("--saps", type=int, default=2, help="number of SAPs of the L2VPN")
+    parser.add_argument("--number", type=int, default=3, help="number of L2VPNs per measurement")
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds added to every NetBox request")
+    args = parser.parse_args()
+    vlans = VlanRanges(args.vlans)
+
+    print(f"{'mode':<12}{'objects':>10}{'requests':>10}{'seconds':>10}")
+    for mode in ("per_vlan", "compact"):
+        with FakeNetbox(latency=args.latency) as fake:
+            netbox.api.base_url = f"{fake.url}/api"
+            requests = count_requests()
+            start = perf_counter()
+            for run in range(args.number):
+                provision(vlans, args.saps, mode, run)
+            seconds = (perf_counter() - start) / args.number
+            requests = (count_requests() - requests) / args.number
+            objects = sum(fake.object_counts().values()) / args.number
+        print(f"{mode:<12}{objects:>10.0f}{requests:>10.0f}{seconds:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
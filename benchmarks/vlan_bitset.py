@@ -0,0 +1,85 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark of combining the VLANs of many SAPs on a port, as the VLAN validators do.
+
+Compares combining ``VlanRanges`` with ``|=`` and ``-=`` with combining ``VlanBitset``s, for ports with hundreds of
+SAPs. Run with ``python -m benchmarks.vlan_bitset``.
+"""
+
+import argparse
+import random
+from timeit import timeit
+
+from nwastdlib.vlans import VlanRanges
+from utils.vlans import VlanBitset
+
+
+def sap_vlans(saps: int, seed: int = 0) -> list[str]:
+    """Return the stored vlan values of saps SAPs, a mix of single VLANs and small ranges."""
+    rng = random.Random(seed)
+    values = []
+    for vlan in rng.sample(range(2, 4000), saps):
+        values.append(str(vlan) if rng.random() < 0.7 else f"{vlan}-{vlan + rng.randint(1, 8)}")
+    return values
+
+
+def ranges_overlap(ranges: list[tuple[int, int]], other: list[tuple[int, int]]) -> bool:
+    """Return True if at least one VLAN is in both sorted ranges, the check the validators did before VlanBitset."""
+    i = j = 0
+    while i < len(ranges) and j < len(other):
+        if ranges[i][1] < other[j][0]:
+            i += 1
+        elif other[j][1] < ranges[i][0]:
+            j += 1
+        else:
+            return True
+    return False
+
+
+def vlan_ranges_not_in_use(allocated: list[VlanRanges], current: VlanRanges, vlan: VlanRanges) -> bool:
+    used_vlans = VlanRanges([])
+    for allocated_vlans in allocated:
+        used_vlans |= allocated_vlans
+    used_vlans -= current
+    return not ranges_overlap(vlan.to_list_of_tuples(), used_vlans.to_list_of_tuples())
+
+
+def vlan_bitset_not_in_use(allocated: list[VlanRanges], current: VlanRanges, vlan: VlanRanges) -> bool:
+    used_vlans = VlanBitset()
+    for allocated_vlans in allocated:
+        used_vlans |= VlanBitset.from_ranges(allocated_vlans.to_list_of_tuples())
+    used_vlans -= VlanBitset.from_ranges(current.to_list_of_tuples())
+    return not VlanBitset.from_ranges(vlan.to_list_of_tuples()) & used_vlans
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20, help="number of calls per measurement")
+    args = parser.parse_args()
+
+    print(f"{'saps':>6}{'VlanRanges (ms)':>18}{'VlanBitset (ms)':>18}{'speedup':>10}")
+    for saps in (10, 100, 300, 1000):
+        values = sap_vlans(saps)
+        allocated = [VlanRanges(value) for value in values]
+        current, vlan = allocated[0], VlanRanges("4001-4094")
+        assert VlanRanges(str(VlanBitset.from_string(",".join(values)))) == VlanRanges(",".join(values))
+        assert vlan_ranges_not_in_use(allocated, current, vlan) == vlan_bitset_not_in_use(allocated, current, vlan)
+
+        ranges_time = timeit(lambda: vlan_ranges_not_in_use(allocated, current, vlan), number=args.number)
+        bitset_time = timeit(lambda: vlan_bitset_not_in_use(allocated, current, vlan), number=args.number)
+        ranges_ms, bitset_ms = ranges_time / args.number * 1000, bitset_time / args.number * 1000
+        print(f"{saps:>6}{ranges_ms:>18.3f}{bitset_ms:>18.3f}{ranges_ms / bitset_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
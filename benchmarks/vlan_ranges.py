@@ -0,0 +1,78 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark of the VLAN overlap and containment checks used by the VLAN validators.
+
+Compares checking every VLAN ID against the ranges with the ``VlanBitset`` checks of the validators, including the
+conversion from ``VlanRanges``, on a full trunk and on worst case fragmented ranges. Run with
+``python -m benchmarks.vlan_ranges``.
+"""
+
+import argparse
+from collections.abc import Callable
+from timeit import timeit
+
+from nwastdlib.vlans import VlanRanges
+from utils.vlans import VlanBitset
+
+
+def per_vlan_overlap(vlan: VlanRanges, vlan_range: VlanRanges) -> bool:
+    return any(v in vlan_range for v in vlan)
+
+
+def per_vlan_contained(vlan: VlanRanges, vlan_range: VlanRanges) -> bool:
+    return all(v in vlan_range for v in vlan)
+
+
+def bitset_overlap(vlan: VlanRanges, vlan_range: VlanRanges) -> bool:
+    return bool(
+        VlanBitset.from_ranges(vlan.to_list_of_tuples()) & VlanBitset.from_ranges(vlan_range.to_list_of_tuples())
+    )
+
+
+def bitset_contained(vlan: VlanRanges, vlan_range: VlanRanges) -> bool:
+    return VlanBitset.from_ranges(vlan.to_list_of_tuples()).issubset(
+        VlanBitset.from_ranges(vlan_range.to_list_of_tuples())
+    )
+
+
+def vlans(values: range) -> VlanRanges:
+    return VlanRanges(",".join(map(str, values)))
+
+
+TRUNK = VlanRanges("2-4094")
+EVEN = vlans(range(2, 4095, 2))  # worst case fragmentation, 2047 ranges
+ODD = vlans(range(3, 4094, 2))
+
+CASES: list[tuple[str, Callable, Callable, VlanRanges, VlanRanges]] = [
+    ("overlap, trunk vs last vlan", per_vlan_overlap, bitset_overlap, TRUNK, VlanRanges("4094")),
+    ("overlap, even vs odd vlans", per_vlan_overlap, bitset_overlap, EVEN, ODD),
+    ("contained, trunk in trunk", per_vlan_contained, bitset_contained, TRUNK, TRUNK),
+    ("contained, even in even", per_vlan_contained, bitset_contained, EVEN, EVEN),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100, help="number of calls per measurement")
+    args = parser.parse_args()
+
+    print(f"{'case':<32}{'per vlan (ms)':>16}{'bitset (ms)':>16}{'speedup':>10}")
+    for name, per_vlan, bitset, vlan, vlan_range in CASES:
+        assert per_vlan(vlan, vlan_range) == bitset(vlan, vlan_range)
+        per_vlan_time = timeit(lambda: per_vlan(vlan, vlan_range), number=args.number) / args.number * 1000
+        bitset_time = timeit(lambda: bitset(vlan, vlan_range), number=args.number) / args.number * 1000
+        print(f"{name:<32}{per_vlan_time:>16.3f}{bitset_time:>16.3f}{per_vlan_time / bitset_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@ from uuid import UUID
 
 from orchestrator.core.db import db
 from orchestrator.core.db.database import BaseModel
-from sqlalchemy import String, select, text
+from sqlalchemy import ForeignKey, Index, Integer, String, select, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import mapped_column
 
 from pydantic_forms.types import UUIDstr
@@ -20,3 +21,36 @@ class CustomerTable(BaseModel):
     def get_customer_name(cls, customer_id: UUID | UUIDstr) -> str | None:
         stmt = select(cls.fullname).where(cls.customer_id == str(customer_id))
         return db.session.execute(stmt).scalars().one_or_none()
+
+
+class PortVlanOccupancyTable(BaseModel):
+    """VLAN ranges in use on a port, by the subscription and product type that uses them.
+
+    Derived from the vlan values of the SAPs of all subscriptions that are not terminated, kept up to date by the
+    workflows of the products with SAPs and rebuilt by the ``task_rebuild_vlan_occupancy`` task.
+    """
+
+    __tablename__ = "port_vlan_occupancy"
+    __table_args__ = (
+        Index(
+            "ix_port_vlan_occupancy_port_product_vlans",
+            "port_subscription_id",
+            "product_type",
+            "vlan_start",
+            "vlan_end",
+        ),
+    )
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=True)
+    port_subscription_id = mapped_column(
+        PG_UUID(as_uuid=True), ForeignKey("subscriptions.subscription_id", ondelete="CASCADE"), nullable=False
+    )
+    subscription_id = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("subscriptions.subscription_id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    product_type = mapped_column(String(255), nullable=False)
+    vlan_start = mapped_column(Integer, nullable=False)
+    vlan_end = mapped_column(Integer, nullable=False)
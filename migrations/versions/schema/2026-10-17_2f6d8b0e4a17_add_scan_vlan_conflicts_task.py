@@ -0,0 +1,48 @@
+"""Add scan VLAN conflicts task.
+
+Revision ID: 2f6d8b0e4a17
+Revises: 5e7a9c3d1b24
+Create Date: 2026-10-17
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from orchestrator.core.migrations.helpers import delete_workflow
+from orchestrator.core.targets import Target
+
+# revision identifiers, used by Alembic.
+revision = "2f6d8b0e4a17"
+down_revision = "5e7a9c3d1b24"
+branch_labels = None
+depends_on = None
+
+new_workflows = [
+    {
+        "name": "task_scan_vlan_conflicts",
+        "target": Target.SYSTEM,
+        "is_task": True,
+        "description": "Scan for VLAN conflicts",
+    },
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO workflows(name, target, is_task, description)
+                VALUES (:name, :target, :is_task, :description)
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            workflow,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        delete_workflow(conn, workflow["name"])
@@ -0,0 +1,48 @@
+"""Add IPAM utilisation task.
+
+Revision ID: 4c8e2f1a9b73
+Revises: 610caa9e4286
+Create Date: 2026-10-17
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from orchestrator.core.migrations.helpers import delete_workflow
+from orchestrator.core.targets import Target
+
+# revision identifiers, used by Alembic.
+revision = "4c8e2f1a9b73"
+down_revision = "610caa9e4286"
+branch_labels = None
+depends_on = None
+
+new_workflows = [
+    {
+        "name": "task_ipam_utilisation",
+        "target": Target.SYSTEM,
+        "is_task": True,
+        "description": "IPAM utilisation",
+    },
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO workflows(name, target, is_task, description)
+                VALUES (:name, :target, :is_task, :description)
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            workflow,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        delete_workflow(conn, workflow["name"])
@@ -0,0 +1,112 @@
+"""Add port VLAN occupancy table and rebuild task.
+
+Revision ID: 5e7a9c3d1b24
+Revises: 9d3b61e0c5a2
+Create Date: 2026-10-17
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from orchestrator.core.migrations.helpers import delete_workflow
+from orchestrator.core.targets import Target
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5e7a9c3d1b24"
+down_revision = "9d3b61e0c5a2"
+branch_labels = None
+depends_on = None
+
+new_workflows = [
+    {
+        "name": "task_rebuild_vlan_occupancy",
+        "target": Target.SYSTEM,
+        "is_task": True,
+        "description": "Rebuild port VLAN occupancy",
+    },
+]
+
+SAP_VLANS = """
+    SELECT port_si.subscription_id, sap_si.subscription_id, p.product_type, siv.value
+    FROM subscription_instance_values siv
+    JOIN resource_types rt ON siv.resource_type_id = rt.resource_type_id
+    JOIN subscription_instances sap_si ON siv.subscription_instance_id = sap_si.subscription_instance_id
+    JOIN subscriptions s ON sap_si.subscription_id = s.subscription_id
+    JOIN products p ON s.product_id = p.product_id
+    JOIN subscription_instance_relations sir ON sap_si.subscription_instance_id = sir.in_use_by_id
+    JOIN subscription_instances port_si ON sir.depends_on_id = port_si.subscription_instance_id
+    WHERE rt.resource_type = 'vlan' AND s.status != 'terminated'
+"""
+
+
+def parse_vlan_ranges(value: str) -> list[tuple[int, int]]:
+    """Parse a vlan value like ``10-20,30`` into (start, end) tuples, without depending on the application code."""
+    ranges = []
+    for part in value.replace(" ", "").split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        ranges.append((int(start), int(end or start)))
+    return ranges
+
+
+def upgrade() -> None:
+    occupancy_table = op.create_table(
+        "port_vlan_occupancy",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("port_subscription_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("subscription_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("product_type", sa.String(length=255), nullable=False),
+        sa.Column("vlan_start", sa.Integer(), nullable=False),
+        sa.Column("vlan_end", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["port_subscription_id"], ["subscriptions.subscription_id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["subscription_id"], ["subscriptions.subscription_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_port_vlan_occupancy_port_product_vlans",
+        "port_vlan_occupancy",
+        ["port_subscription_id", "product_type", "vlan_start", "vlan_end"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_port_vlan_occupancy_subscription_id"), "port_vlan_occupancy", ["subscription_id"], unique=False
+    )
+
+    conn = op.get_bind()
+    rows = [
+        {
+            "port_subscription_id": port_subscription_id,
+            "subscription_id": subscription_id,
+            "product_type": product_type,
+            "vlan_start": vlan_start,
+            "vlan_end": vlan_end,
+        }
+        for port_subscription_id, subscription_id, product_type, value in conn.execute(sa.text(SAP_VLANS))
+        for vlan_start, vlan_end in parse_vlan_ranges(value)
+    ]
+    if rows:
+        op.bulk_insert(occupancy_table, rows)
+
+    for workflow in new_workflows:
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO workflows(name, target, is_task, description)
+                VALUES (:name, :target, :is_task, :description)
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            workflow,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        delete_workflow(conn, workflow["name"])
+
+    op.drop_index(op.f("ix_port_vlan_occupancy_subscription_id"), table_name="port_vlan_occupancy")
+    op.drop_index("ix_port_vlan_occupancy_port_product_vlans", table_name="port_vlan_occupancy")
+    op.drop_table("port_vlan_occupancy")
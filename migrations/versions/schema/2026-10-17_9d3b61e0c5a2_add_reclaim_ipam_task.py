@@ -0,0 +1,48 @@
+"""Add reclaim IPAM task.
+
+Revision ID: 9d3b61e0c5a2
+Revises: 4c8e2f1a9b73
+Create Date: 2026-10-17
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from orchestrator.core.migrations.helpers import delete_workflow
+from orchestrator.core.targets import Target
+
+# revision identifiers, used by Alembic.
+revision = "9d3b61e0c5a2"
+down_revision = "4c8e2f1a9b73"
+branch_labels = None
+depends_on = None
+
+new_workflows = [
+    {
+        "name": "task_reclaim_ipam",
+        "target": Target.SYSTEM,
+        "is_task": True,
+        "description": "Reclaim orphaned IPAM objects",
+    },
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        conn.execute(
+            sa.text(
+                """
+                INSERT INTO workflows(name, target, is_task, description)
+                VALUES (:name, :target, :is_task, :description)
+                ON CONFLICT DO NOTHING
+                """
+            ),
+            workflow,
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for workflow in new_workflows:
+        delete_workflow(conn, workflow["name"])
@@ -12,12 +12,24 @@
 # limitations under the License.
 
 
-from typing import List
-
+from typing import Any, List
+from uuid import UUID
+
+from orchestrator.core.db import (
+    ProductBlockTable,
+    ResourceTypeTable,
+    SubscriptionInstanceRelationTable,
+    SubscriptionInstanceTable,
+    SubscriptionInstanceValueTable,
+    SubscriptionTable,
+    db,
+)
 from orchestrator.core.domain.base import ProductBlockModel
 from orchestrator.core.types import SubscriptionLifecycle
-from pydantic import computed_field
+from pydantic import PrivateAttr, computed_field
+from sqlalchemy import select
 
+from nwastdlib.vlans import VlanRanges
 from products.product_blocks.node import NodeBlock, NodeBlockInactive, NodeBlockProvisioning
 from pydantic_forms.types import strEnum
 
@@ -55,27 +67,62 @@ class PortBlockProvisioning(PortBlockInactive, lifecycle=[SubscriptionLifecycle.
     ims_id: int
     nrm_id: int | None = None
 
-    def _active_sap_blocks(self) -> List:
-        from products.product_blocks.sap import SAPBlock
-
-        return [
-            SAPBlock.from_db(subscription_instance.subscription_instance_id)
-            for subscription_instance in self.in_use_by
-            if subscription_instance.product_block.tag == "SAP"
-            and subscription_instance.subscription.status == SubscriptionLifecycle.ACTIVE
-        ]
+    _active_sap_values = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if not name.startswith("_"):
+            self._active_sap_values = None
+        super().__setattr__(name, value)
+
+    def active_sap_values(self) -> List[dict[str, str]]:
+        """Get the vlan and ims_id values of the active SAPBlock's that use this PortBlock, with a single query.
+
+        The values are fetched once per port instance, so serialising the computed fields of a port with many SAPs
+        does not load every SAPBlock one by one. Changing a field of the port fetches them again.
+        """
+        if self._active_sap_values is None:
+            self._active_sap_values = self._query_active_sap_values()
+        return self._active_sap_values
+
+    def _query_active_sap_values(self) -> List[dict[str, str]]:
+        value_table = SubscriptionInstanceValueTable
+        query = (
+            select(value_table.subscription_instance_id, ResourceTypeTable.resource_type, value_table.value)
+            .join(ResourceTypeTable, value_table.resource_type_id == ResourceTypeTable.resource_type_id)
+            .join(
+                SubscriptionInstanceRelationTable,
+                value_table.subscription_instance_id == SubscriptionInstanceRelationTable.in_use_by_id,
+            )
+            .join(
+                SubscriptionInstanceTable,
+                value_table.subscription_instance_id == SubscriptionInstanceTable.subscription_instance_id,
+            )
+            .join(ProductBlockTable, SubscriptionInstanceTable.product_block_id == ProductBlockTable.product_block_id)
+            .join(SubscriptionTable, SubscriptionInstanceTable.subscription_id == SubscriptionTable.subscription_id)
+            .where(
+                SubscriptionInstanceRelationTable.depends_on_id == self.subscription_instance_id,
+                ProductBlockTable.tag == "SAP",
+                SubscriptionTable.status == SubscriptionLifecycle.ACTIVE,
+                ResourceTypeTable.resource_type.in_(["vlan", "ims_id"]),
+            )
+            .order_by(value_table.subscription_instance_id)
+        )
+        saps: dict[UUID, dict[str, str]] = {}
+        for subscription_instance_id, resource_type, value in db.session.execute(query):
+            saps.setdefault(subscription_instance_id, {})[resource_type] = value
+        return list(saps.values())
 
     @computed_field  # type: ignore[misc]
     @property
     def vlans(self) -> List[int]:
         """Get list of active VLANs by looking at SAPBlock's that use this PortBlock."""
-        return [sap_block.vlan for sap_block in self._active_sap_blocks()]
+        return [VlanRanges(sap["vlan"]) for sap in self.active_sap_values() if "vlan" in sap]
 
     @computed_field  # type: ignore[misc]
     @property
     def vlan_group_ims_ids(self) -> List[int]:
         """Get list of active IMS VLAN GROUP IDs by looking at SAPBlock's that use this PortBlock."""
-        return [sap_block.ims_id for sap_block in self._active_sap_blocks()]
+        return [int(sap["ims_id"]) for sap in self.active_sap_values() if "ims_id" in sap]
 
     @computed_field  # type: ignore[misc]
     @property
@@ -44,7 +44,8 @@ def build_port_payload(model: PortBlockProvisioning, subscription: SubscriptionM
     Returns: :class:`netbox.InterfacePayload`
 
     """
-    vlan_ids = [vlan.id for group_id in model.vlan_group_ims_ids for vlan in netbox.get_vlans(group_id=group_id)]
+    # the VLANs of all groups at once, including the VLANs of compact SAPs that only exist as vid_ranges so far
+    vlan_ids = [vlan.id for vlan in netbox.materialise_vlans(model.vlan_group_ims_ids)]
     return netbox.InterfacePayload(
         device=model.node.ims_id,
         name=model.port_name,
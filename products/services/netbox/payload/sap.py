@@ -14,8 +14,31 @@
 
 from orchestrator.core.domain import SubscriptionModel
 
+from nwastdlib.vlans import VlanRanges
 from products.product_blocks.sap import SAPBlockProvisioning
 from services import netbox
+from settings import settings
+
+
+def sap_vlan_mode(product_type: str) -> str:
+    """Return how the VLANs of the SAPs of product_type are provisioned, see :func:`build_vlan_payloads`."""
+    return settings.NETBOX_SAP_VLAN_MODES.get(product_type, "per_vlan")
+
+
+def build_vlan_payloads(name: str, group: int, vlan: VlanRanges, mode: str = "per_vlan") -> list[netbox.VlanPayload]:
+    """Create and return the Netbox :class:`VlanPayload` objects for the VLANs of a VLAN group.
+
+    In ``per_vlan`` mode every VLAN ID gets its own VLAN object up front. In ``compact`` mode no VLAN objects are
+    created, the VLAN group's ``vid_ranges`` hold the VLAN IDs until :func:`services.netbox.materialise_vlans`
+    creates them in bulk for the port that is tagged with them or the L2VPN they are terminated on.
+    """
+    if mode == "compact":
+        return []
+    return [
+        netbox.VlanPayload(vid=vid, group=group, name=f"{name} - {vid}")
+        for start, end in vlan.to_list_of_tuples()
+        for vid in range(start, end + 1)
+    ]
 
 
 def build_sap_vlans_payload(model: SAPBlockProvisioning, subscription: SubscriptionModel) -> list[netbox.VlanPayload]:
@@ -39,10 +62,7 @@ def build_sap_vlans_payload(model: SAPBlockProvisioning, subscription: Subscript
     """
     assert model.ims_id, "IMS id must be present when creating VLAN payloads"
     name = f"{model.port.node.node_name} {model.port.port_name}"
-    vlan_list = [
-        vlan for vlan_start, vlan_end in model.vlan.to_list_of_tuples() for vlan in range(vlan_start, vlan_end + 1)
-    ]
-    return [netbox.VlanPayload(vid=vlan, group=model.ims_id, name=f"{name} - {vlan}") for vlan in vlan_list]
+    return build_vlan_payloads(name, model.ims_id, model.vlan, sap_vlan_mode(subscription.product.product_type))
 
 
 def build_sap_vlan_group_payload(
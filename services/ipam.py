@@ -0,0 +1,353 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Orchestrator side allocation of IP addresses from NetBox prefixes."""
+
+import atexit
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from ipaddress import IPv4Network, ip_address, ip_interface, ip_network
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any
+
+import structlog
+
+from services import netbox
+from services.netbox import AvailablePrefixPayload, InterfacePayload, IpAddressPayload, IpPrefixPayload, api
+from settings import settings
+from utils.intervals import IntervalSet
+
+logger = structlog.get_logger(__name__)
+
+
+class AddressAllocator:
+    """Allocate the lowest free address of a prefix, using a local index of the addresses that are in use.
+
+    The index is an :class:`IntervalSet` of the used addresses. It is synced incrementally, by only fetching the
+    addresses with an id above the highest one seen, and completely every IPAM_RESYNC_INTERVAL seconds to also
+    notice deleted addresses. A free address is found in O(log n) and reserved with a single create, no matter how
+    full the prefix is. The network address, and on IPv4 the broadcast address, are never allocated because NetBox
+    does not allow them to be assigned to an interface.
+
+    Other processes may allocate from the same prefix. NetBox refuses duplicate addresses, when the address was
+    taken in the meantime the index is synced and the next free address is tried.
+    """
+
+    def __init__(self, prefix: str) -> None:
+        self.network = ip_network(prefix)
+        self.first = int(self.network.network_address) + 1
+        self.last = int(self.network.broadcast_address) - isinstance(self.network, IPv4Network)
+        self.used = IntervalSet()
+        self.last_id = 0
+        self.synced_at: float | None = None
+        self._lock = Lock()
+
+    def sync(self, full: bool = False) -> None:
+        """Add the addresses that were created in NetBox since the last sync to the index."""
+        if full or self.synced_at is None or monotonic() - self.synced_at > settings.IPAM_RESYNC_INTERVAL:
+            self.used, self.last_id, self.synced_at = IntervalSet(), 0, monotonic()
+        for address in netbox.iter_objects(
+            api.ipam.ip_addresses, after_id=self.last_id, parent=str(self.network), brief=True
+        ):
+            self.used.add(int(ip_interface(address.address).ip))
+            self.last_id = max(self.last_id, address.id)
+
+    def allocate(
+        self, description: str, assigned_object_id: int | None = None, assigned_object_type: str = "dcim.interface"
+    ) -> int:
+        """Create the lowest free address of the prefix in NetBox and return its id.
+
+        Raises:
+            ValueError: when the prefix is full, or NetBox refused the address for another reason than that it was
+                already taken.
+        """
+        with self._lock:
+            self.sync()
+            for _ in range(settings.IPAM_ALLOCATE_ATTEMPTS):
+                if (value := self.used.first_free(self.first, self.last)) is None:
+                    self.sync(full=True)
+                    if (value := self.used.first_free(self.first, self.last)) is None:
+                        raise ValueError(f"Prefix {self.network} has no available addresses")
+                address = f"{ip_address(value)}/{self.network.prefixlen}"
+                payload = IpAddressPayload(
+                    address=address,
+                    description=description,
+                    assigned_object_id=assigned_object_id,
+                    assigned_object_type=assigned_object_type,
+                )
+                try:
+                    id = netbox.create(payload)
+                except ValueError:
+                    self.sync()
+                    if value not in self.used:
+                        raise
+                    logger.info("Address was taken concurrently, trying the next one", address=address)
+                    continue
+                self.used.add(value)
+                return id
+        raise ValueError(f"No address allocated from {self.network} in {settings.IPAM_ALLOCATE_ATTEMPTS} attempts")
+
+    def stats(self) -> dict[str, int]:
+        return {"size": self.last - self.first + 1, "used": self.used.count(), "intervals": len(self.used)}
+
+
+_allocators: dict[str, AddressAllocator] = {}
+_allocators_lock = Lock()
+
+
+def get_allocator(prefix: str) -> AddressAllocator:
+    """Return the allocator of prefix, shared by all threads of this process."""
+    with _allocators_lock:
+        if prefix not in _allocators:
+            _allocators[prefix] = AddressAllocator(prefix)
+        return _allocators[prefix]
+
+
+def reserve_loopback_addresses(device_id: int) -> tuple[int, int]:
+    """Reserve IP IPv4/IPv6 loopback addresses, assign to Loopback0, and return address id.
+
+    The IPv4 and IPv6 address are reserved concurrently. When one of them fails, the other address and the Loopback0
+    interface are deleted again before the exception is raised, so the step can be retried.
+    """
+    device = netbox.get_device(id=device_id)
+    interface_id = netbox.create(InterfacePayload(device=device_id, name="Loopback0", type="virtual", enabled=True))
+
+    def reserve_loopback_address(ip_version: str, prefix: str) -> int:
+        return get_allocator(prefix).allocate(f"{ip_version} loopback {device.name}", assigned_object_id=interface_id)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(copy_context().run, reserve_loopback_address, ip_version, prefix)
+            for ip_version, prefix in (("IPv4", settings.IPv4_LOOPBACK_PREFIX), ("IPv6", settings.IPv6_LOOPBACK_PREFIX))
+        ]
+    if errors := [future.exception() for future in futures if future.exception()]:
+        for future in futures:
+            if not future.exception():
+                netbox.delete_ip_address(id=future.result())
+        netbox.delete_interface(id=interface_id)
+        logger.warning("Reserving loopback addresses failed, rolled back", device=device.name, errors=errors)
+        raise errors[0]
+
+    ipv4_id, ipv6_id = (future.result() for future in futures)
+    return ipv4_id, ipv6_id
+
+
+PREFIX_POOL_DESCRIPTION = "reserved by prefix pool"
+
+
+@dataclass
+class ClaimedPrefix:
+    id: int
+    prefix: str
+    address_ids: list[int]
+    addresses: list[str]
+
+
+class PrefixPool:
+    """Warm queue of prefixes of prefix_length that are reserved in the parent prefix ahead of time.
+
+    Claiming a prefix takes it from the queue and creates its addresses with a single bulk create, after which the
+    prefix is marked active with a single PATCH. A background thread carves new prefixes, with status reserved and
+    a single request, when the queue drops below low_water, until there are high_water prefixes in the queue. When
+    the queue is empty a prefix is carved on demand.
+
+    The queue only exists in memory. Other processes may still have the reserved prefixes of the parent in their own
+    queue, so they are not adopted on start. Instead, the queued prefixes are deleted from NetBox when the process
+    exits normally. A process that is killed leaks up to high_water reserved prefixes, remove them with the
+    ``task_reclaim_ipam`` task and its ``include_pool_reservations`` option.
+    """
+
+    def __init__(self, parent: str, prefix_length: int, low_water: int, high_water: int) -> None:
+        self.parent = parent
+        self.prefix_length = prefix_length
+        self.low_water = low_water
+        self.high_water = high_water
+        self._parent_id: int | None = None
+        self._queue: deque[tuple[int, str]] = deque()
+        self._lock = Lock()
+        self._refill_lock = Lock()
+        self._refill_needed = Event()
+        self._thread: Thread | None = None
+
+    def _carve(self, count: int) -> list[tuple[int, str]]:
+        if self._parent_id is None:
+            self._parent_id = netbox.get_ip_prefix(prefix=self.parent).id
+        payload = AvailablePrefixPayload(
+            prefix_length=self.prefix_length, description=PREFIX_POOL_DESCRIPTION, status="reserved"
+        )
+        prefixes = netbox.create_available_prefixes(self._parent_id, [payload] * count)
+        return [(prefix.id, str(prefix.prefix)) for prefix in prefixes]
+
+    def refill(self) -> None:
+        """Carve prefixes until there are high_water prefixes in the queue."""
+        with self._refill_lock:
+            with self._lock:
+                missing = self.high_water - len(self._queue)
+            if missing > 0:
+                carved = self._carve(missing)
+                with self._lock:
+                    self._queue.extend(carved)
+                logger.debug("Refilled prefix pool", parent=self.parent, carved=len(carved))
+
+    def _refill_forever(self) -> None:
+        while True:
+            self._refill_needed.wait()
+            self._refill_needed.clear()
+            try:
+                self.refill()
+            except Exception:
+                logger.exception("Refilling prefix pool failed", parent=self.parent)
+
+    def _take(self) -> tuple[int, str] | None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._refill_forever, name=f"prefix-pool {self.parent}", daemon=True)
+                self._thread.start()
+                atexit.register(self.release)
+            reserved = self._queue.popleft() if self._queue else None
+            if len(self._queue) < self.low_water:
+                self._refill_needed.set()
+            return reserved
+
+    def claim(self, description: str, assignments: Sequence[tuple[int, str]]) -> ClaimedPrefix:
+        """Claim a prefix and create its addresses, in order, for the given (interface id, description) pairs.
+
+        When the addresses or the prefix update are refused, the prefix and the addresses that were created are
+        deleted again, so no reserved prefix is left behind.
+
+        Raises:
+            ValueError: when NetBox refused the addresses or the prefix update.
+        """
+        prefix_id, prefix = self._take() or self._carve(1)[0]
+        network = ip_network(prefix)
+        addresses = [
+            f"{ip_address(int(network.network_address) + offset)}/{network.prefixlen}"
+            for offset in range(len(assignments))
+        ]
+        address_ids: list[int] = []
+        try:
+            address_ids = netbox.bulk_create(
+                [
+                    IpAddressPayload(address=address, description=address_description, assigned_object_id=interface_id)
+                    for address, (interface_id, address_description) in zip(addresses, assignments)
+                ]
+            )
+            netbox.bulk_update({prefix_id: IpPrefixPayload(description=description, prefix=prefix, is_pool=False)})
+        except Exception:
+            self._release_claim(prefix_id, address_ids)
+            raise
+        return ClaimedPrefix(id=prefix_id, prefix=prefix, address_ids=address_ids, addresses=addresses)
+
+    def _release_claim(self, prefix_id: int, address_ids: list[int]) -> None:
+        try:
+            netbox.bulk_delete(api.ipam.ip_addresses, address_ids)
+            netbox.bulk_delete(api.ipam.prefixes, [prefix_id])
+        except Exception:
+            logger.exception("Releasing failed prefix claim failed", parent=self.parent, prefix_id=prefix_id)
+        else:
+            logger.info("Released prefix of failed claim", parent=self.parent, prefix_id=prefix_id)
+
+    def release(self) -> None:
+        """Delete the reserved prefixes that are still in the queue from NetBox."""
+        with self._refill_lock, self._lock:
+            prefix_ids = [prefix_id for prefix_id, _ in self._queue]
+            self._queue.clear()
+        if prefix_ids:
+            try:
+                netbox.bulk_delete(api.ipam.prefixes, prefix_ids)
+            except Exception:
+                logger.exception("Releasing prefix pool failed", parent=self.parent, prefix_ids=prefix_ids)
+            else:
+                logger.debug("Released prefix pool", parent=self.parent, released=len(prefix_ids))
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+_core_link_prefix_pool: PrefixPool | None = None
+
+
+def get_core_link_prefix_pool() -> PrefixPool:
+    """Return the pool of IPv6 core link prefixes of this process."""
+    global _core_link_prefix_pool
+    with _allocators_lock:
+        if _core_link_prefix_pool is None:
+            _core_link_prefix_pool = PrefixPool(
+                settings.IPv6_CORE_LINK_PREFIX,
+                prefix_length=127,
+                low_water=settings.IPAM_CORE_LINK_POOL_LOW_WATER,
+                high_water=settings.IPAM_CORE_LINK_POOL_HIGH_WATER,
+            )
+        return _core_link_prefix_pool
+
+
+MAX_FORECAST_DAYS = 100 * 365
+
+
+def _used_ranges(prefix: str) -> Iterator[tuple[int, int, datetime]]:
+    """Yield (first, last, created) of the child prefixes and addresses of prefix, fetching only these fields."""
+    version = ip_network(prefix).version
+    for child in netbox.iter_objects(api.ipam.prefixes, within=prefix, fields="id,prefix,created"):
+        if (network := ip_network(child.prefix)).version != version:
+            continue
+        yield int(network.network_address), int(network.broadcast_address), datetime.fromisoformat(child.created)
+    for address in netbox.iter_objects(api.ipam.ip_addresses, parent=prefix, fields="id,address,created"):
+        value = int(ip_interface(address.address).ip)
+        yield value, value, datetime.fromisoformat(address.created)
+
+
+def prefix_utilisation(prefix: str, window_days: int) -> dict[str, Any]:
+    """Return the utilisation and fragmentation of prefix, and forecast when it will be exhausted.
+
+    The used space is indexed as an :class:`IntervalSet` of the child prefixes and addresses. The fragmentation is
+    the part of the free space that is not in the largest free block (0 when all free space is contiguous). The
+    allocation rate is the growth of the used space over the last window_days days, deleted objects are not taken
+    into account.
+    """
+    network = ip_network(prefix)
+    first, last = int(network.network_address), int(network.broadcast_address)
+    window_start = datetime.now(UTC) - timedelta(days=window_days)
+
+    ranges = sorted(_used_ranges(prefix))
+    used = IntervalSet((start, end) for start, end, _ in ranges)
+    used_before_window = IntervalSet((start, end) for start, end, created in ranges if created < window_start)
+
+    size = last - first + 1
+    used_count = used.count()
+    free = size - used_count
+    free_blocks = [end - start + 1 for start, end in used.gaps(first, last)]
+    largest_free_block = max(free_blocks, default=0)
+    rate = (used_count - used_before_window.count()) / window_days
+    days_to_exhaustion = free / rate if rate else None
+
+    return {
+        "prefix": prefix,
+        "size": size,
+        "used": used_count,
+        "free": free,
+        "utilisation": round(100 * used_count / size, 2),
+        "free_blocks": len(free_blocks),
+        "largest_free_block": largest_free_block,
+        "fragmentation": round(1 - largest_free_block / free, 4) if free else 0.0,
+        "allocation_rate_per_day": round(rate, 2),
+        "days_to_exhaustion": round(days_to_exhaustion, 1) if days_to_exhaustion is not None else None,
+        "exhaustion_date": (
+            (datetime.now(UTC) + timedelta(days=days_to_exhaustion)).date().isoformat()
+            if days_to_exhaustion is not None and days_to_exhaustion < MAX_FORECAST_DAYS
+            else None
+        ),
+    }
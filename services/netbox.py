@@ -12,23 +12,280 @@
 # limitations under the License.
 
 
+import socket
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from copy import deepcopy
 from dataclasses import asdict, dataclass, field
-from functools import singledispatch
-from ipaddress import IPv4Interface, IPv6Interface
-from typing import Any, List, Tuple
+from functools import singledispatch, wraps
+from itertools import batched
+from time import perf_counter, sleep
+from typing import Any, Callable, List
 
+import requests
 import structlog
 from pynetbox import api as pynetbox_api
 from pynetbox.core.endpoint import Endpoint
 from pynetbox.core.query import RequestError
+from pynetbox.core.response import Record
 from pynetbox.models.ipam import IpAddresses, Prefixes
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.exceptions import NewConnectionError
 
+from services import netbox_metrics
 from settings import settings
+from utils.cache import TTLCache
+from utils.retry import CircuitBreaker, RetryPolicy, RetryStats
 from utils.singledispatch import single_dispatch_base
+from utils.singleflight import SingleFlight
 
 logger = structlog.get_logger(__name__)
 
+
+retry_policy = RetryPolicy(
+    total=settings.NETBOX_RETRY_TOTAL,
+    backoff_factor=settings.NETBOX_RETRY_BACKOFF_FACTOR,
+    backoff_max=settings.NETBOX_RETRY_BACKOFF_MAX,
+)
+circuit_breaker = CircuitBreaker(
+    "netbox",
+    failure_threshold=settings.NETBOX_CIRCUIT_FAILURE_THRESHOLD,
+    reset_timeout=settings.NETBOX_CIRCUIT_RESET_TIMEOUT,
+)
+retry_stats = RetryStats()
+
+
+def _is_connect_error(exc: requests.RequestException) -> bool:
+    """Return True if the request failed before it could be sent."""
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with a default timeout, optional TCP keep-alive on the pooled connections and retries.
+
+    Requests does not have a session wide timeout, and pynetbox does not pass one, so the configured timeout is
+    applied to every request that is sent without an explicit timeout.
+
+    Failed requests are retried according to the retry policy, and all requests are refused while the circuit
+    breaker is open. The number of retries of every call is recorded in the retry statistics.
+    """
+
+    def __init__(
+        self,
+        timeout: tuple[float, float],
+        keepalive: bool = True,
+        retry_policy: RetryPolicy = retry_policy,
+        circuit_breaker: CircuitBreaker = circuit_breaker,
+        retry_stats: RetryStats = retry_stats,
+        **kwargs: Any,
+    ) -> None:
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.retry_stats = retry_stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self.keepalive:
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+
+        method = request.method or "GET"
+        sent_bytes = len(request.body or b"")
+        start = perf_counter()
+        try:
+            response = self._send_with_retries(request, method, **kwargs)
+        except Exception as exc:
+            netbox_metrics.observe(method, request.url or "", type(exc).__name__, perf_counter() - start, sent_bytes)
+            raise
+        netbox_metrics.observe(
+            method, request.url or "", response.status_code, perf_counter() - start, sent_bytes, len(response.content)
+        )
+        return response
+
+    def _send_with_retries(self, request: requests.PreparedRequest, method: str, **kwargs: Any) -> requests.Response:
+        retries = 0
+        while True:
+            self.circuit_breaker.check()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if not self.retry_policy.should_retry(method, retries, connect_error=_is_connect_error(exc)):
+                    self._record(retries, failed=True)
+                    raise
+                logger.warning("Netbox request failed", method=method, url=request.url, retries=retries, exc=str(exc))
+            else:
+                if not self.retry_policy.should_retry(method, retries, status=response.status_code):
+                    self._record(retries, failed=response.status_code >= 500)
+                    return response
+                logger.warning(
+                    "Netbox request failed",
+                    method=method,
+                    url=request.url,
+                    retries=retries,
+                    status=response.status_code,
+                )
+                response.close()
+            retries += 1
+            sleep(self.retry_policy.backoff(retries))
+
+    def _record(self, retries: int, failed: bool) -> None:
+        self.retry_stats.record(retries)
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def pool_stats(self) -> dict[str, int]:
+        """Return request and connection counters summed over all host pools of this adapter.
+
+        Every request that did not need a new connection is counted as a pool hit. Counters of host pools that
+        were evicted from the pool manager are lost, this does not happen as long as NETBOX_POOL_CONNECTIONS is
+        at least the number of NetBox hosts used.
+        """
+        pools = self.poolmanager.pools
+        with pools.lock:
+            host_pools = [pools[key] for key in pools.keys()]
+        requests_sent = sum(pool.num_requests for pool in host_pools)
+        connections = sum(pool.num_connections for pool in host_pools)
+        return {
+            "pools": len(host_pools),
+            "requests": requests_sent,
+            "hits": requests_sent - connections,
+            "misses": connections,
+            "idle_connections": sum(pool.pool.qsize() for pool in host_pools if pool.pool is not None),
+        }
+
+
+def _build_http_session() -> requests.Session:
+    """Build the connection pooled HTTP session that is used by the pynetbox client."""
+    session = requests.Session()
+    adapter = PooledHTTPAdapter(
+        timeout=(settings.NETBOX_CONNECT_TIMEOUT, settings.NETBOX_READ_TIMEOUT),
+        keepalive=settings.NETBOX_KEEPALIVE,
+        pool_connections=settings.NETBOX_POOL_CONNECTIONS,
+        pool_maxsize=settings.NETBOX_POOL_MAXSIZE,
+        pool_block=settings.NETBOX_POOL_BLOCK,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not settings.NETBOX_KEEPALIVE:
+        session.headers["Connection"] = "close"
+    return session
+
+
 api = pynetbox_api(url=settings.NETBOX_URL, token=settings.NETBOX_TOKEN)
+api.http_session = _build_http_session()
+
+
+def get_pool_stats() -> dict[str, int]:
+    """Return the connection pool hit/miss counters of the NetBox HTTP session."""
+    return api.http_session.get_adapter(settings.NETBOX_URL).pool_stats()
+
+
+def get_retry_stats() -> dict[str, int]:
+    """Return the number of calls to NetBox and the number of retries they needed."""
+    return retry_stats.as_dict()
+
+
+reference_cache = TTLCache(maxsize=settings.NETBOX_CACHE_MAXSIZE, ttl=settings.NETBOX_CACHE_TTL)
+
+
+def _call_key(endpoint: Endpoint, func: Callable, kwargs: dict) -> tuple[str, str, str]:
+    return endpoint.url, func.__name__, repr(sorted(kwargs.items()))
+
+
+def cached(endpoint: Endpoint) -> Callable:
+    """Cache the results of a getter for slow changing reference data on endpoint, when NETBOX_CACHE_ENABLED is set.
+
+    Entries are keyed on the endpoint, the getter and its keyword arguments, and are removed when an object on the
+    same endpoint is created, updated or deleted through this module.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(**kwargs: Any) -> Any:
+            if not settings.NETBOX_CACHE_ENABLED:
+                return func(**kwargs)
+
+            key = _call_key(endpoint, func, kwargs)
+            found, value = reference_cache.get(key)
+            if not found:
+                value = func(**kwargs)
+                reference_cache.set(key, value)
+            return list(value) if isinstance(value, list) else value
+
+        return wrapper
+
+    return decorator
+
+
+in_flight = SingleFlight()
+
+
+def _own_copy(value: Any) -> Any:
+    """Return a copy of a record or list of records that a caller can modify without affecting other callers."""
+    if isinstance(value, list):
+        return [_own_copy(item) for item in value]
+    if isinstance(value, Record):
+        return type(value)(deepcopy(dict(value)), value.api, value.endpoint)
+    return value
+
+
+def coalesced(endpoint: Endpoint) -> Callable:
+    """Let identical concurrent calls of a getter on endpoint share one request, when NETBOX_COALESCE_ENABLED is set.
+
+    Calls are identical when they use the same getter with the same keyword arguments. Every caller gets its own
+    copy of the shared result, so only use this on getters that return a record or a list, not a lazy RecordSet.
+    Callers that arrive after an object on endpoint was created, updated or deleted through this module start a new
+    request.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(**kwargs: Any) -> Any:
+            if not settings.NETBOX_COALESCE_ENABLED:
+                return func(**kwargs)
+
+            return _own_copy(in_flight.do(_call_key(endpoint, func, kwargs), func, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+# Last state written to Netbox by this process per (endpoint url, object id), independent of NETBOX_CACHE_ENABLED.
+# Only a hint for updates, because other processes may have written the same object since.
+written_state = TTLCache(maxsize=settings.NETBOX_CACHE_MAXSIZE, ttl=settings.NETBOX_CACHE_TTL)
+
+
+def invalidate_cache(endpoint: Endpoint) -> None:
+    """Remove all cached results of endpoint, and stop sharing the results of calls on endpoint that are in flight."""
+    in_flight.forget(lambda key: key[0] == endpoint.url)
+    if reference_cache.invalidate(lambda key: key[0] == endpoint.url):
+        logger.debug("Invalidated cached Netbox objects", endpoint=endpoint.name)
+
+
+def get_cache_stats() -> dict[str, int]:
+    """Return the hit/miss statistics of the reference data cache."""
+    return reference_cache.stats()
+
+
+def get_coalesce_stats() -> dict[str, int]:
+    """Return the number of getter calls that were sent to NetBox and the number that shared an in flight call."""
+    return in_flight.stats()
 
 
 @dataclass
@@ -117,6 +374,7 @@ class AvailablePrefixPayload:
     prefix_length: int
     description: str
     is_pool: bool | None = False
+    status: str | None = "active"
 
 
 @dataclass
@@ -127,6 +385,15 @@ class AvailableIpPayload:
     status: str | None = "active"
 
 
+@dataclass
+class IpAddressPayload(NetboxPayload):
+    address: str
+    description: str
+    assigned_object_id: int | None = None
+    assigned_object_type: str | None = "dcim.interface"
+    status: str | None = "active"
+
+
 @dataclass
 class VlanPayload(NetboxPayload):
     vid: int
@@ -161,26 +428,38 @@ class L2vpnTerminationPayload(NetboxPayload):
     assigned_object_type: str | None = "ipam.vlan"
 
 
+@cached(api.dcim.sites)
+@coalesced(api.dcim.sites)
 def get_sites(**kwargs) -> List:
     return list(api.dcim.sites.filter(**kwargs))
 
 
+@cached(api.dcim.sites)
+@coalesced(api.dcim.sites)
 def get_site(**kwargs):
     return api.dcim.sites.get(**kwargs)
 
 
+@cached(api.dcim.device_roles)
+@coalesced(api.dcim.device_roles)
 def get_device_roles(**kwargs) -> List:
     return list(api.dcim.device_roles.filter(**kwargs))
 
 
+@cached(api.dcim.device_roles)
+@coalesced(api.dcim.device_roles)
 def get_device_role(**kwargs):
     return api.dcim.device_roles.get(**kwargs)
 
 
+@cached(api.dcim.device_types)
+@coalesced(api.dcim.device_types)
 def get_device_types(**kwargs) -> List:
     return list(api.dcim.device_types.filter(**kwargs))
 
 
+@cached(api.dcim.device_types)
+@coalesced(api.dcim.device_types)
 def get_device_type(**kwargs):
     return api.dcim.device_types.get(**kwargs)
 
@@ -189,6 +468,7 @@ def get_devices(**kwargs) -> List:
     return api.dcim.devices.filter(**kwargs)
 
 
+@coalesced(api.dcim.devices)
 def get_device(**kwargs):
     return api.dcim.devices.get(**kwargs)
 
@@ -197,6 +477,7 @@ def get_interfaces(**kwargs) -> List:
     return api.dcim.interfaces.filter(**kwargs)
 
 
+@coalesced(api.dcim.interfaces)
 def get_interface(**kwargs):
     return api.dcim.interfaces.get(**kwargs)
 
@@ -205,6 +486,7 @@ def get_cables(**kwargs) -> List:
     return api.dcim.cables.filter(**kwargs)
 
 
+@coalesced(api.dcim.cables)
 def get_cable(**kwargs):
     return api.dcim.cables.get(**kwargs)
 
@@ -213,6 +495,7 @@ def get_l2vpns(**kwargs):
     return api.vpn.l2vpns.filter(**kwargs)
 
 
+@coalesced(api.vpn.l2vpns)
 def get_l2vpn(**kwargs):
     return api.vpn.l2vpns.get(**kwargs)
 
@@ -221,6 +504,7 @@ def get_l2vpn_terminations(**kwargs):
     return api.vpn.l2vpn_terminations.filter(**kwargs)
 
 
+@coalesced(api.vpn.l2vpn_terminations)
 def get_l2vpn_termination(**kwargs):
     return api.vpn.l2vpn_terminations.get(**kwargs)
 
@@ -229,6 +513,34 @@ def get_vlans(**kwargs):
     return api.ipam.vlans.filter(**kwargs)
 
 
+def get_vlan_groups(**kwargs):
+    return api.ipam.vlan_groups.filter(**kwargs)
+
+
+def materialise_vlans(group_ids: Sequence[int]) -> list:
+    """Return a VLAN for every VLAN ID in the ``vid_ranges`` of the VLAN groups, creating the missing ones in bulk.
+
+    The VLANs of compact SAPs only exist as the ``vid_ranges`` of their VLAN group until a port is tagged with them
+    or they are terminated on an L2VPN, both of which need a VLAN object per VLAN ID.
+    """
+    if not group_ids:
+        return []
+    vlans = list(get_vlans(group_id=list(group_ids)))
+    existing = {(vlan.group.id, vlan.vid) for vlan in vlans}
+    missing = [
+        VlanPayload(vid=vid, group=group.id, name=f"{group.name} - {vid}")
+        for group in get_vlan_groups(id=list(group_ids))
+        for start, end in group.vid_ranges
+        for vid in range(start, end + 1)
+        if (group.id, vid) not in existing
+    ]
+    if not missing:
+        return vlans
+    bulk_create(missing)
+    return list(get_vlans(group_id=list(group_ids)))
+
+
+@coalesced(api.ipam.vlans)
 def get_vlan(**kwargs):
     return api.ipam.vlans.get(**kwargs)
 
@@ -237,6 +549,7 @@ def get_ip_prefixes(**kwargs) -> List:
     return api.ipam.prefixes.filter(**kwargs)
 
 
+@coalesced(api.ipam.prefixes)
 def get_ip_prefix(**kwargs):
     return api.ipam.prefixes.get(**kwargs)
 
@@ -245,14 +558,51 @@ def get_ip_addresses(**kwargs):
     return api.ipam.ip_addresses.filter(**kwargs)
 
 
+@coalesced(api.ipam.ip_addresses)
 def get_ip_address(**kwargs):
     return api.ipam.ip_addresses.get(**kwargs)
 
 
+def iter_objects(
+    endpoint: Endpoint, page_size: int | None = None, prefetch: bool = False, after_id: int = 0, **kwargs
+) -> Iterator[Record]:
+    """Yield the objects on endpoint that match kwargs, fetching one page at a time.
+
+    Pages are selected on id (ordering=id, id__gt=<last id of previous page>) instead of offset, so every page is
+    as cheap to fetch as the first one and the caller can delete the yielded objects while iterating.
+
+    Args:
+        endpoint: a Netbox Endpoint
+        page_size: number of objects per request, defaults to NETBOX_PAGE_SIZE.
+        prefetch: fetch the next page in the background while the current page is being processed.
+        after_id: only yield the objects with an id higher than this one, e.g. the highest id seen in a previous run.
+        kwargs: filters to apply, the same as for endpoint.filter().
+    """
+    page_size = page_size or settings.NETBOX_PAGE_SIZE
+
+    def fetch_page(after_id: int) -> list[Record]:
+        # Passing an offset makes pynetbox return a single page instead of following the next links.
+        return list(endpoint.filter(limit=page_size, offset=0, ordering="id", id__gt=after_id, **kwargs))
+
+    with ThreadPoolExecutor(max_workers=1) if prefetch else nullcontext() as executor:
+        page = fetch_page(after_id)
+        while page:
+            last_page = len(page) < page_size
+            next_page: Future | None = None
+            if executor and not last_page:
+                next_page = executor.submit(fetch_page, page[-1].id)
+            yield from page
+            if last_page:
+                return
+            page = next_page.result() if next_page else fetch_page(page[-1].id)
+
+
 def delete_from_netbox(endpoint, **kwargs) -> None:
     """Try to delete object with given kwargs from endpoint, raise an exception when object was not found."""
     if object := endpoint.get(**kwargs):
         object.delete()
+        written_state.invalidate(lambda key: key == (endpoint.url, object.id))
+        invalidate_cache(endpoint)
     else:
         raise ValueError(f"object not found on {endpoint.name} endpoint")
 
@@ -289,60 +639,49 @@ def delete_vlan_group(**kwargs) -> None:
     delete_from_netbox(api.ipam.vlan_groups, **kwargs)
 
 
-def skip_network_address(ip_prefix: Prefixes) -> None:
-    """Assign placeholders for network address(es) in available IPS of the prefix.
+def delete_vlans(ids: Sequence[int]) -> None:
+    bulk_delete(api.ipam.vlans, ids)
 
-    Helper function for reserve_loopback_addresses().
-    Ensures that the first available ip from the prefix is not a network address.
-    """
 
-    def is_network_address(address: IpAddresses) -> bool:
-        addr = IPv4Interface(address) if address.family == 4 else IPv6Interface(address)
-        return addr.ip == addr.network.network_address
+def _parent_prefix(parent_id: int) -> Prefixes:
+    """Return a prefix record with only an id, enough to use its available-prefixes and available-ips endpoints.
 
-    while True:
-        if not (address := next(iter(ip_prefix.available_ips.list()), None)):
-            raise ValueError(f"Prefix {ip_prefix} has no available addresses")
+    This saves fetching the parent prefix from Netbox before every reservation in it.
+    """
+    return Prefixes({"id": parent_id}, api, api.ipam.prefixes)
 
-        if not is_network_address(address):
-            return
 
-        ip_prefix.available_ips.create({"description": "placeholder"})
+def create_available_prefix(parent_id: int, payload: AvailablePrefixPayload) -> Prefixes:
+    return _parent_prefix(parent_id).available_prefixes.create(asdict(payload))
 
 
-def reserve_loopback_addresses(device_id: int) -> Tuple:
-    """Reserve IP IPv4/IPv6 loopback addresses, assign to Loopback0, and return address id."""
-    device = get_device(id=device_id)
-    interface_id = create(InterfacePayload(device=device_id, name="Loopback0", type="virtual", enabled=True))
+def create_available_prefixes(parent_id: int, payloads: Sequence[AvailablePrefixPayload]) -> list[Prefixes]:
+    """Create a prefix for every payload in the parent prefix with a single request."""
+    return _parent_prefix(parent_id).available_prefixes.create([asdict(payload) for payload in payloads])
 
-    def reserve_loopback_address(ip_version: str, prefix: str) -> int:
-        ip_prefix = get_ip_prefix(prefix=prefix)
-        # The netbox v3 API incorrectly allowed assigning the network address to an interface.
-        #
-        # The netbox v4 API now rejects this. But that raises the question of how to skip the non-network
-        # address(es). There might be a better way, but for now we assign placeholders for the network address(es).
-        skip_network_address(ip_prefix)
-        address = ip_prefix.available_ips.create(
-            asdict(
-                AvailableIpPayload(description=f"{ip_version} loopback {device.name}", assigned_object_id=interface_id)
-            )
-        )
-        return address.id
 
-    return tuple(
-        reserve_loopback_address(ip_version, prefix)
-        for ip_version, prefix in (("IPv4", settings.IPv4_LOOPBACK_PREFIX), ("IPv6", settings.IPv6_LOOPBACK_PREFIX))
-    )
+def create_available_ip(parent_id: int, payload: AvailableIpPayload) -> IpAddresses:
+    return _parent_prefix(parent_id).available_ips.create(asdict(payload))
 
 
-def create_available_prefix(parent_id: int, payload: AvailablePrefixPayload) -> Prefixes:
-    parent_prefix = get_ip_prefix(id=parent_id)
-    return parent_prefix.available_prefixes.create(asdict(payload))
+def create_available_ips(parent_id: int, payloads: Sequence[AvailableIpPayload]) -> list[IpAddresses]:
+    """Reserve an address for every payload in the parent prefix with a single request.
 
+    Netbox assigns the free addresses in ascending order and creates them in a single transaction.
 
-def create_available_ip(parent_id: int, payload: AvailableIpPayload) -> IpAddresses:
-    parent_prefix = get_ip_prefix(id=parent_id)
-    return parent_prefix.available_ips.create(asdict(payload))
+    Returns:
+        The created addresses, in the same order as the payloads.
+
+    Raises:
+        ValueError: when Netbox refused (one of) the payloads, e.g. because the prefix has not enough free addresses.
+    """
+    if not payloads:
+        return []
+    try:
+        return _parent_prefix(parent_id).available_ips.create([asdict(payload) for payload in payloads])
+    except RequestError as exc:
+        logger.warning("Netbox reserve addresses failed", parent_id=parent_id, size=len(payloads), exc=str(exc))
+        raise ValueError(f"invalid AvailableIpPayload: {exc.message}") from exc
 
 
 @singledispatch
@@ -385,6 +724,8 @@ def _create_object(payload: NetboxPayload, endpoint: Endpoint) -> int:
         logger.warning("Netbox create failed", payload=payload, exc=str(exc))
         raise ValueError(f"invalid NetboxPayload: {exc.message}") from exc
     else:
+        written_state.set((endpoint.url, object.id), payload.dict())
+        invalidate_cache(endpoint)
         return object.id
 
 
@@ -418,6 +759,11 @@ def _(payload: IpPrefixPayload, **kwargs: Any) -> int:
     return _create_object(payload, endpoint=api.ipam.prefixes)
 
 
+@create.register
+def _(payload: IpAddressPayload, **kwargs: Any) -> int:
+    return _create_object(payload, endpoint=api.ipam.ip_addresses)
+
+
 @create.register
 def _(payload: InterfacePayload, **kwargs: Any) -> int:
     return _create_object(payload, endpoint=api.dcim.interfaces)
@@ -435,8 +781,7 @@ def _(payload: VlanPayload, **kwargs: Any) -> int:
 
 @create.register
 def _(payload: VlansPayload, **kwargs: Any) -> int:
-    for vlan_payload in payload.vlans:
-        _create_object(vlan_payload, endpoint=api.ipam.vlans)
+    bulk_create(payload.vlans)
     return payload.vlans[0].group
 
 
@@ -464,9 +809,10 @@ def update(payload: NetboxPayload, **kwargs: Any) -> bool:
     Args:
         payload: Netbox object specific payload.
         id: ID of object to be updated
+        previous: optional payload with the known previous state of the object, saves fetching it from Netbox.
 
     Returns:
-        True if the object was updated successfully in Netbox, False otherwise.
+        True if the object was updated successfully in Netbox, False if nothing changed and no update was sent.
 
     Raises:
         TypeError: in case a specific implementation could not be found. The payload it was called for will be
@@ -476,41 +822,232 @@ def update(payload: NetboxPayload, **kwargs: Any) -> bool:
     return single_dispatch_base(update, payload)
 
 
-def _update_object(payload: NetboxPayload, id: int, endpoint: Endpoint) -> bool:
+def _update_object(payload: NetboxPayload, id: int, endpoint: Endpoint, previous: NetboxPayload | None = None) -> bool:
     """
-    Create or update an object in Netbox.
+    Update an object in Netbox with a single PATCH request.
+
+    When the caller supplies the previous state of the object, only the fields that differ from it are sent, and
+    nothing is sent when nothing changed. The state last written by this process is only a hint, other processes
+    may have changed the object since: when it differs from the payload the complete payload is sent without fetching
+    the object first, otherwise the object is fetched and pynetbox sends only the fields that differ from Netbox.
 
     Args:
-        payload: values to create or update object
+        payload: values to update object
+        id: ID of object to be updated
         endpoint: a Netbox Endpoint
+        previous: known previous state of the object
 
     Returns:
-         True if the node was created or updated, False otherwise
+         True if the object was updated, False if nothing changed (no-op)
 
     Raises:
         ValueError if object does not exist yet in Netbox.
     """
-    if not (object := endpoint.get(id)):
-        raise ValueError(f"Netbox object with id {id} on netbox {endpoint.name} endpoint not found")
-    object.update(payload.dict())
-    return object.save()
+    new_state = payload.dict()
+    if previous is not None:
+        previous_state = previous.dict()
+        changes = {key: value for key, value in new_state.items() if previous_state.get(key) != value}
+    elif (written := written_state.get((endpoint.url, id)))[0]:
+        changes = new_state if written[1] != new_state else {}
+    else:
+        changes = {}
+
+    if changes:
+        try:
+            endpoint.update([changes | {"id": id}])
+        except RequestError as exc:
+            if exc.req.status_code == requests.codes.not_found:
+                raise ValueError(f"Netbox object with id {id} on netbox {endpoint.name} endpoint not found") from exc
+            raise
+        updated = True
+    elif previous is not None:
+        logger.debug("Netbox update is a no-op", endpoint=endpoint.name, id=id)
+        updated = False
+    else:
+        if not (object := endpoint.get(id)):
+            raise ValueError(f"Netbox object with id {id} on netbox {endpoint.name} endpoint not found")
+        if not (updated := object.update(new_state)):
+            logger.debug("Netbox update is a no-op", endpoint=endpoint.name, id=id)
+
+    written_state.set((endpoint.url, id), new_state)
+    if updated:
+        invalidate_cache(endpoint)
+    return updated
 
 
 @update.register
 def _(payload: DevicePayload, id: int, **kwargs: Any) -> bool:
-    return _update_object(payload, id, endpoint=api.dcim.devices)
+    return _update_object(payload, id, endpoint=api.dcim.devices, **kwargs)
 
 
 @update.register
 def _(payload: CablePayload, id: int, **kwargs: Any) -> bool:
-    return _update_object(payload, id, endpoint=api.dcim.cables)
+    return _update_object(payload, id, endpoint=api.dcim.cables, **kwargs)
 
 
 @update.register
 def _(payload: DeviceTypePayload, id: int, **kwargs: Any) -> bool:
-    return _update_object(payload, id, endpoint=api.dcim.device_types)
+    return _update_object(payload, id, endpoint=api.dcim.device_types, **kwargs)
 
 
 @update.register
 def _(payload: InterfacePayload, id: int, **kwargs: Any) -> bool:
-    return _update_object(payload, id, endpoint=api.dcim.interfaces)
+    return _update_object(payload, id, endpoint=api.dcim.interfaces, **kwargs)
+
+
+@singledispatch
+def get_endpoint(payload: NetboxPayload) -> Endpoint:
+    """Return the Netbox endpoint that stores the objects described by payload (generic function).
+
+    Used by the bulk functions below, that need the endpoint of a list of payloads of the same type.
+
+    Raises:
+        TypeError: in case a specific implementation could not be found. The payload it was called for will be
+            part of the error message.
+
+    """
+    return single_dispatch_base(get_endpoint, payload)
+
+
+@get_endpoint.register
+def _(payload: DevicePayload) -> Endpoint:
+    return api.dcim.devices
+
+
+@get_endpoint.register
+def _(payload: DeviceRolePayload) -> Endpoint:
+    return api.dcim.device_roles
+
+
+@get_endpoint.register
+def _(payload: ManufacturerPayload) -> Endpoint:
+    return api.dcim.manufacturers
+
+
+@get_endpoint.register
+def _(payload: DeviceTypePayload) -> Endpoint:
+    return api.dcim.device_types
+
+
+@get_endpoint.register
+def _(payload: CablePayload) -> Endpoint:
+    return api.dcim.cables
+
+
+@get_endpoint.register
+def _(payload: IpPrefixPayload) -> Endpoint:
+    return api.ipam.prefixes
+
+
+@get_endpoint.register
+def _(payload: IpAddressPayload) -> Endpoint:
+    return api.ipam.ip_addresses
+
+
+@get_endpoint.register
+def _(payload: InterfacePayload) -> Endpoint:
+    return api.dcim.interfaces
+
+
+@get_endpoint.register
+def _(payload: SitePayload) -> Endpoint:
+    return api.dcim.sites
+
+
+@get_endpoint.register
+def _(payload: VlanPayload) -> Endpoint:
+    return api.ipam.vlans
+
+
+@get_endpoint.register
+def _(payload: VlanGroupPayload) -> Endpoint:
+    return api.ipam.vlan_groups
+
+
+@get_endpoint.register
+def _(payload: L2vpnPayload) -> Endpoint:
+    return api.vpn.l2vpns
+
+
+@get_endpoint.register
+def _(payload: L2vpnTerminationPayload) -> Endpoint:
+    return api.vpn.l2vpn_terminations
+
+
+def _bulk_endpoint(payloads: Sequence[NetboxPayload]) -> Endpoint:
+    if len(payload_types := {type(payload) for payload in payloads}) > 1:
+        raise TypeError(f"bulk operations need payloads of a single type, got: {', '.join(map(str, payload_types))}")
+    return get_endpoint(payloads[0])
+
+
+def bulk_create(payloads: Sequence[NetboxPayload], batch_size: int | None = None) -> list[int]:
+    """Create the objects described by payloads in Netbox with one request per batch.
+
+    The payloads are posted as a list to the endpoint of the payload type, Netbox creates all objects of a batch
+    in a single transaction. Batches that were sent before a failing batch are not rolled back.
+
+    Args:
+        payloads: Netbox object specific payloads, all of the same type.
+        batch_size: maximum number of objects per request, defaults to NETBOX_BULK_BATCH_SIZE.
+
+    Returns:
+        The ids of the created objects in Netbox, in the same order as the payloads.
+
+    Raises:
+        ValueError: when Netbox refused (one of) the payloads of a batch.
+    """
+    if not payloads:
+        return []
+
+    endpoint = _bulk_endpoint(payloads)
+    ids: list[int] = []
+    for batch in batched(payloads, batch_size or settings.NETBOX_BULK_BATCH_SIZE):
+        try:
+            objects = endpoint.create([payload.dict() for payload in batch])
+        except RequestError as exc:
+            logger.warning("Netbox bulk create failed", endpoint=endpoint.name, size=len(batch), exc=str(exc))
+            raise ValueError(f"invalid NetboxPayload: {exc.message}") from exc
+        ids.extend(object.id for object in objects)
+        for object, payload in zip(objects, batch):
+            written_state.set((endpoint.url, object.id), payload.dict())
+        invalidate_cache(endpoint)
+    return ids
+
+
+def bulk_update(payloads: dict[int, NetboxPayload], batch_size: int | None = None) -> list[int]:
+    """Update the objects described by payloads in Netbox with one PATCH request per batch.
+
+    Args:
+        payloads: Netbox object specific payloads, all of the same type, by id of the object to update.
+        batch_size: maximum number of objects per request, defaults to NETBOX_BULK_BATCH_SIZE.
+
+    Returns:
+        The ids of the updated objects in Netbox.
+
+    Raises:
+        ValueError: when Netbox refused (one of) the payloads of a batch.
+    """
+    if not payloads:
+        return []
+
+    endpoint = _bulk_endpoint(list(payloads.values()))
+    ids: list[int] = []
+    for batch in batched(payloads.items(), batch_size or settings.NETBOX_BULK_BATCH_SIZE):
+        try:
+            objects = endpoint.update([payload.dict() | {"id": id} for id, payload in batch])
+        except RequestError as exc:
+            logger.warning("Netbox bulk update failed", endpoint=endpoint.name, size=len(batch), exc=str(exc))
+            raise ValueError(f"invalid NetboxPayload: {exc.message}") from exc
+        ids.extend(object.id for object in objects)
+        for id, payload in batch:
+            written_state.set((endpoint.url, id), payload.dict())
+        invalidate_cache(endpoint)
+    return ids
+
+
+def bulk_delete(endpoint: Endpoint, ids: Sequence[int], batch_size: int | None = None) -> None:
+    """Delete the objects with the given ids from endpoint with one DELETE request per batch."""
+    for batch in batched(ids, batch_size or settings.NETBOX_BULK_BATCH_SIZE):
+        endpoint.delete(list(batch))
+        written_state.invalidate(lambda key: key[0] == endpoint.url and key[1] in batch)
+        invalidate_cache(endpoint)
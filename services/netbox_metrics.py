@@ -0,0 +1,110 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Instrumentation of the calls to NetBox.
+
+Every call done through the NetBox clients is counted per endpoint, method and workflow step, and its latency and
+request/response sizes are recorded. The metrics are kept in a separate Prometheus registry that is exposed by the
+application on ``/api/netbox/metrics``, and every call is logged with structlog at debug level.
+"""
+
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+import structlog
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+logger = structlog.get_logger(__name__)
+
+registry = CollectorRegistry(auto_describe=True)
+
+LABELS = ("endpoint", "method", "step")
+
+requests_total = Counter(
+    "netbox_requests", "Number of calls to NetBox", [*LABELS, "status"], namespace="orchestrator", registry=registry
+)
+request_duration = Histogram(
+    "netbox_request_duration_seconds",
+    "Latency of calls to NetBox including retries",
+    LABELS,
+    namespace="orchestrator",
+    registry=registry,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+request_bytes = Counter(
+    "netbox_request_bytes",
+    "Size of the request bodies sent to NetBox",
+    LABELS,
+    namespace="orchestrator",
+    registry=registry,
+)
+response_bytes = Counter(
+    "netbox_response_bytes",
+    "Size of the response bodies received from NetBox",
+    LABELS,
+    namespace="orchestrator",
+    registry=registry,
+)
+
+_current_step: ContextVar[str | None] = ContextVar("netbox_step", default=None)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@contextmanager
+def netbox_step(name: str) -> Iterator[None]:
+    """Tag the NetBox calls done within this context with name."""
+    token = _current_step.set(name)
+    try:
+        yield
+    finally:
+        _current_step.reset(token)
+
+
+def current_step() -> str:
+    """Return the name to tag NetBox calls with.
+
+    That is the name set with :func:`netbox_step`, or else the step function that orchestrator-core binds as ``func``
+    to the structlog context while it executes a workflow step.
+    """
+    if step := _current_step.get():
+        return step
+    return structlog.contextvars.get_contextvars().get("func") or "unknown"
+
+
+def endpoint_name(url: str) -> str:
+    """Return the endpoint of url with object ids replaced, e.g. ``ipam/prefixes/{id}/available-ips``."""
+    path = urlsplit(url).path.rstrip("/")
+    path = path.split("/api/", 1)[-1]
+    return _ID_SEGMENT.sub("/{id}", f"/{path}").lstrip("/")
+
+
+def observe(
+    method: str, url: str, status: int | str, duration: float, sent_bytes: int = 0, received_bytes: int = 0
+) -> None:
+    """Record a single call to NetBox."""
+    labels = {"endpoint": endpoint_name(url), "method": method, "step": current_step()}
+    requests_total.labels(**labels, status=str(status)).inc()
+    request_duration.labels(**labels).observe(duration)
+    request_bytes.labels(**labels).inc(sent_bytes)
+    response_bytes.labels(**labels).inc(received_bytes)
+    logger.debug(
+        "Netbox call",
+        **labels,
+        status=status,
+        duration=round(duration, 4),
+        sent_bytes=sent_bytes,
+        received_bytes=received_bytes,
+    )
@@ -12,6 +12,8 @@
 # limitations under the License.
 
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -22,6 +24,34 @@ class Settings(BaseSettings):
     IPv6_LOOPBACK_PREFIX: str = "fc00:0:0:127::/64"
     IPv4_CORE_LINK_PREFIX: str = "10.0.10.0/24"
     IPv6_CORE_LINK_PREFIX: str = "fc00:0:0:10::/64"
+    IPAM_RESYNC_INTERVAL: float = 600.0  # seconds between full syncs of the local address allocators
+    IPAM_ALLOCATE_ATTEMPTS: int = 5  # addresses to try when they are concurrently taken by someone else
+    IPAM_CORE_LINK_POOL_LOW_WATER: int = 2  # refill the pool of reserved core link prefixes below this size
+    IPAM_CORE_LINK_POOL_HIGH_WATER: int = 8  # number of reserved core link prefixes after a refill
+    IPAM_FORECAST_WINDOW_DAYS: int = 30  # allocation rate period used to forecast prefix exhaustion
+    IPAM_EXHAUSTION_WARNING_DAYS: int = 90  # warn about prefixes that are forecast to be exhausted sooner
+    # HTTP connection pool used by the NetBox client
+    NETBOX_POOL_CONNECTIONS: int = 4  # number of per-host pools to keep
+    NETBOX_POOL_MAXSIZE: int = 20  # maximum number of connections kept per host
+    NETBOX_POOL_BLOCK: bool = False  # wait for a free connection instead of opening an extra one
+    NETBOX_KEEPALIVE: bool = True
+    NETBOX_CONNECT_TIMEOUT: float = 5.0  # seconds
+    NETBOX_READ_TIMEOUT: float = 30.0  # seconds
+    # Retries of failed NetBox calls and circuit breaker
+    NETBOX_RETRY_TOTAL: int = 3  # maximum number of retries per call
+    NETBOX_RETRY_BACKOFF_FACTOR: float = 0.5  # seconds, doubled for every retry
+    NETBOX_RETRY_BACKOFF_MAX: float = 10.0  # seconds
+    NETBOX_CIRCUIT_FAILURE_THRESHOLD: int = 5  # consecutive failed calls before failing fast
+    NETBOX_CIRCUIT_RESET_TIMEOUT: float = 30.0  # seconds to fail fast before trying again
+    NETBOX_BULK_BATCH_SIZE: int = 100  # maximum number of objects per bulk request
+    NETBOX_PAGE_SIZE: int = 250  # number of objects per page when streaming list queries
+    # Read-through cache for slow changing NetBox reference data (sites, device roles and device types)
+    NETBOX_CACHE_ENABLED: bool = False
+    NETBOX_CACHE_TTL: float = 300.0  # seconds
+    NETBOX_CACHE_MAXSIZE: int = 256  # maximum number of cached results
+    NETBOX_COALESCE_ENABLED: bool = True  # share the result of identical concurrent GETs
+    # How the VLANs of SAPs are provisioned by product type, "per_vlan" (default) or "compact" (one VLAN per range)
+    NETBOX_SAP_VLAN_MODES: dict[str, Literal["per_vlan", "compact"]] = {}
 
 
 settings = Settings()
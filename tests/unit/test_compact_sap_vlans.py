@@ -0,0 +1,73 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections.abc import Generator
+from types import SimpleNamespace
+
+import pytest
+
+from nwastdlib.vlans import VlanRanges
+from products.product_blocks.port import PortMode
+from products.services.netbox.payload.port import build_port_payload
+from products.services.netbox.payload.sap import build_vlan_payloads
+from services import netbox
+from utils.fake_netbox import FakeNetbox
+
+
+@pytest.fixture
+def fake_netbox() -> Generator[FakeNetbox, None, None]:
+    base_url = netbox.api.base_url
+    with FakeNetbox() as fake:
+        netbox.api.base_url = f"{fake.url}/api"
+        yield fake
+    netbox.api.base_url = base_url
+
+
+def create_sap(name: str, vlans: VlanRanges, mode: str) -> int:
+    """Create the VLAN group and VLANs of a SAP like the create workflows do."""
+    slug = name.replace(" ", "-").replace("/", "-")
+    group_id = netbox.create(netbox.VlanGroupPayload(name=name, slug=slug, vid_ranges=vlans.to_list_of_tuples()))
+    if vlan_payloads := build_vlan_payloads(name, group_id, vlans, mode):
+        netbox.create(netbox.VlansPayload(vlans=vlan_payloads))
+    return group_id
+
+
+def tagged_vids(group_ids: list[int]) -> set[int]:
+    port = SimpleNamespace(
+        node=SimpleNamespace(ims_id=1),
+        port_name="0/0/1",
+        port_type="10gbase-x-xfp",
+        port_mode=PortMode.TAGGED,
+        port_description="test",
+        enabled=True,
+        vlan_group_ims_ids=group_ids,
+    )
+    payload = build_port_payload(port, SimpleNamespace(speed=10000))  # type: ignore[arg-type]
+    return {netbox.get_vlan(id=vlan_id).vid for vlan_id in payload.tagged_vlans}
+
+
+@pytest.mark.parametrize("mode", ["per_vlan", "compact"])
+def test_port_tagged_with_sap_covers_every_vid(fake_netbox: FakeNetbox, mode: str) -> None:
+    vlans = VlanRanges("5,10-20,100-102")
+    group_id = create_sap("node01 0/0/1", vlans, mode)
+
+    assert tagged_vids([group_id]) == set(vlans)
+
+
+def test_compact_saps_are_materialised_once(fake_netbox: FakeNetbox) -> None:
+    first = create_sap("node01 0/0/1", VlanRanges("10-20"), "compact")
+    second = create_sap("node02 0/0/1", VlanRanges("15-25"), "compact")
+    assert fake_netbox.object_counts()["ipam/vlans"] == 0
+
+    assert tagged_vids([first, second]) == set(range(10, 26))
+    assert tagged_vids([first, second]) == set(range(10, 26))
+    assert fake_netbox.object_counts()["ipam/vlans"] == 11 + 11
@@ -0,0 +1,544 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-process, in-memory stand-in for the NetBox REST API, to benchmark and load test without a real NetBox.
+
+Only the endpoints used by :mod:`services.netbox` are implemented, with NetBox compatible ids, pagination, filtering,
+nested objects, bulk (list) operations, and the available-ips and available-prefixes endpoints of prefixes. A fixed
+latency, optionally with random jitter, can be added to every request to mimic a remote NetBox.
+
+Run standalone with ``python -m utils.fake_netbox --port 8000 --latency 0.02`` and point NETBOX_URL at it, or use it
+from Python::
+
+    with FakeNetbox(latency=0.01) as fake:
+        api = pynetbox.api(fake.url, token="")
+"""
+
+import argparse
+import json
+import re
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_interface, ip_network, summarize_address_range
+from random import uniform
+from threading import Lock, Thread
+from time import sleep
+from typing import Any
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+API_VERSION = "4.2"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# endpoint -> {field: endpoint referenced by that field}
+FOREIGN_KEYS: dict[str, dict[str, str]] = {
+    "dcim/sites": {},
+    "dcim/device-roles": {},
+    "dcim/manufacturers": {},
+    "dcim/device-types": {"manufacturer": "dcim/manufacturers"},
+    "dcim/devices": {
+        "site": "dcim/sites",
+        "device_type": "dcim/device-types",
+        "role": "dcim/device-roles",
+        "primary_ip4": "ipam/ip-addresses",
+        "primary_ip6": "ipam/ip-addresses",
+    },
+    "dcim/interfaces": {"device": "dcim/devices", "tagged_vlans": "ipam/vlans"},
+    "dcim/cables": {},
+    "ipam/prefixes": {},
+    "ipam/ip-addresses": {},
+    "ipam/vlan-groups": {},
+    "ipam/vlans": {"group": "ipam/vlan-groups"},
+    "vpn/l2vpns": {},
+    "vpn/l2vpn-terminations": {"l2vpn": "vpn/l2vpns"},
+}
+
+# Fields that are unique together per endpoint, like the (global) unique constraints in NetBox
+UNIQUE_TOGETHER: dict[str, list[tuple[str, ...]]] = {
+    "dcim/sites": [("name",), ("slug",)],
+    "dcim/device-roles": [("name",), ("slug",)],
+    "dcim/manufacturers": [("name",), ("slug",)],
+    "dcim/device-types": [("manufacturer", "model"), ("manufacturer", "slug")],
+    "dcim/devices": [("site", "name")],
+    "dcim/interfaces": [("device", "name")],
+    "ipam/vlan-groups": [("name",), ("slug",)],
+    "ipam/vlans": [("group", "vid")],
+    "vpn/l2vpns": [("name",), ("slug",)],
+}
+
+# Deleting an object also deletes the objects that refer to it, endpoint -> [(endpoint, field)]
+CASCADES: dict[str, list[tuple[str, str]]] = {
+    "dcim/devices": [("dcim/interfaces", "device")],
+    "dcim/interfaces": [("ipam/ip-addresses", "assigned_object_id")],
+    "vpn/l2vpns": [("vpn/l2vpn-terminations", "l2vpn")],
+}
+
+CHOICE_FIELDS = {"status", "type", "mode", "family"}
+# Roles of addresses that may be shared, other addresses are unique in the global table (ENFORCE_GLOBAL_UNIQUE)
+NONUNIQUE_IP_ROLES = {"anycast", "vip", "vrrp", "hsrp", "glbp", "carp"}
+NAME_FIELDS = ("name", "model", "address", "prefix", "vid")
+# query parameters that are not filters, brief and fields are ignored and the complete objects are returned
+PAGINATION_PARAMS = {"limit", "offset", "ordering", "brief", "fields", "q"}
+
+_PATH = re.compile(r"^/api/(?P<endpoint>[a-z-]+/[a-z0-9-]+)/(?:(?P<id>\d+)/)?(?P<detail>available-(?:ips|prefixes)/)?$")
+
+
+class FakeNetboxError(Exception):
+    def __init__(self, status: HTTPStatus, body: Any) -> None:
+        self.status = status
+        self.body = body
+
+
+class FakeNetboxStore:
+    """The in-memory object store with the NetBox like semantics, independent of HTTP."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, dict[int, dict]] = {endpoint: {} for endpoint in FOREIGN_KEYS}
+        self.last_id: dict[str, int] = dict.fromkeys(FOREIGN_KEYS, 0)
+        self.base_url = ""
+        self.lock = Lock()
+
+    def url(self, endpoint: str, id: int) -> str:
+        return f"{self.base_url}/api/{endpoint}/{id}/"
+
+    # serialization
+
+    def nested(self, endpoint: str, id: int | None) -> dict | None:
+        if id is None or (object := self.objects[endpoint].get(id)) is None:
+            return None
+        nested = {"id": id, "url": self.url(endpoint, id), "display": self.display(object)}
+        return nested | {field: object[field] for field in (*NAME_FIELDS, "slug") if field in object}
+
+    @staticmethod
+    def display(object: dict) -> str:
+        return next((str(object[field]) for field in NAME_FIELDS if object.get(field) is not None), str(object["id"]))
+
+    def serialize(self, endpoint: str, object: dict) -> dict:
+        result: dict[str, Any] = {"url": self.url(endpoint, object["id"]), "display": self.display(object)}
+        for field, value in object.items():
+            if (referenced := FOREIGN_KEYS[endpoint].get(field)) is not None:
+                value = (
+                    [self.nested(referenced, v) for v in value]
+                    if isinstance(value, list)
+                    else self.nested(referenced, value)
+                )
+            elif field in CHOICE_FIELDS and value is not None:
+                value = {"value": value, "label": str(value).replace("-", " ").title()}
+            result[field] = value
+        return result
+
+    # validation
+
+    def resolve(self, endpoint: str, value: Any) -> Any:
+        """Resolve a foreign key given as id, nested id or nested attributes (as NetBox does) to an id."""
+        if isinstance(value, list):
+            return [self.resolve(endpoint, v) for v in value]
+        if isinstance(value, dict):
+            if "id" in value:
+                value = value["id"]
+            else:
+                objects = self.objects[endpoint].items()
+                matches = [id for id, o in objects if all(o.get(k) == v for k, v in value.items())]
+                if len(matches) != 1:
+                    raise FakeNetboxError(HTTPStatus.BAD_REQUEST, {"detail": f"Related object not found: {value}"})
+                return matches[0]
+        if value is not None and value not in self.objects[endpoint]:
+            raise FakeNetboxError(HTTPStatus.BAD_REQUEST, {"detail": f"Related object not found using id {value}"})
+        return value
+
+    def validate(self, endpoint: str, object: dict) -> None:
+        for fields in UNIQUE_TOGETHER.get(endpoint, []):
+            if any(all(other.get(f) == object.get(f) for f in fields) for other in self.others(endpoint, object)):
+                message = f"{endpoint} with this {' and '.join(fields)} already exists."
+                raise FakeNetboxError(HTTPStatus.BAD_REQUEST, {fields[-1]: [message]})
+
+        if endpoint == "ipam/ip-addresses":
+            address = ip_interface(object["address"])
+            if object.get("role") not in NONUNIQUE_IP_ROLES and (
+                duplicate := next(
+                    (
+                        o
+                        for o in self.others(endpoint, object)
+                        if ip_interface(o["address"]).ip == address.ip and o.get("role") not in NONUNIQUE_IP_ROLES
+                    ),
+                    None,
+                )
+            ):
+                message = f"Duplicate IP address found in global table: {duplicate['address']}"
+                raise FakeNetboxError(HTTPStatus.BAD_REQUEST, {"address": [message]})
+            network, max_length = address.network, address.max_prefixlen
+            if object.get("assigned_object_id") and network.prefixlen < max_length - 1:
+                special = {network.network_address} | (
+                    {network.broadcast_address} if isinstance(network, IPv4Network) else set()
+                )
+                if address.ip in special:
+                    raise FakeNetboxError(
+                        HTTPStatus.BAD_REQUEST,
+                        {"address": [f"{address} is a network ID, which may not be assigned to an interface."]},
+                    )
+        if endpoint == "ipam/prefixes":
+            prefix = ip_network(object["prefix"])
+            if any(ip_network(o["prefix"]) == prefix for o in self.others(endpoint, object)):
+                raise FakeNetboxError(HTTPStatus.BAD_REQUEST, {"prefix": [f"Duplicate prefix found: {prefix}"]})
+
+    def others(self, endpoint: str, object: dict) -> Iterator[dict]:
+        return (other for other in self.objects[endpoint].values() if other["id"] != object["id"])
+
+    # operations
+
+    def create(self, endpoint: str, data: dict) -> dict:
+        object = dict(data)
+        for field, referenced in FOREIGN_KEYS[endpoint].items():
+            if field in object:
+                object[field] = self.resolve(referenced, object[field])
+        if endpoint in ("ipam/ip-addresses", "ipam/prefixes"):
+            key = "address" if endpoint == "ipam/ip-addresses" else "prefix"
+            object["family"] = ip_interface(object[key]).version
+        object.setdefault("status", "active")
+        object["created"] = object["last_updated"] = datetime.now(UTC).isoformat()
+        object["id"] = self.last_id[endpoint] + 1
+        self.validate(endpoint, object)
+        self.last_id[endpoint] = object["id"]
+        self.objects[endpoint][object["id"]] = object
+        return object
+
+    def update(self, endpoint: str, id: int, data: dict) -> dict:
+        if (current := self.objects[endpoint].get(id)) is None:
+            raise FakeNetboxError(HTTPStatus.NOT_FOUND, {"detail": "No object matches the given query."})
+        object = current | {k: v for k, v in data.items() if k not in ("id", "created")}
+        object["last_updated"] = datetime.now(UTC).isoformat()
+        for field, referenced in FOREIGN_KEYS[endpoint].items():
+            if field in data:
+                object[field] = self.resolve(referenced, object[field])
+        self.validate(endpoint, object)
+        self.objects[endpoint][id] = object
+        return object
+
+    def delete(self, endpoint: str, id: int) -> None:
+        if self.objects[endpoint].pop(id, None) is None:
+            raise FakeNetboxError(HTTPStatus.NOT_FOUND, {"detail": "No object matches the given query."})
+        for dependent, field in CASCADES.get(endpoint, []):
+            for dependent_id in [i for i, o in self.objects[dependent].items() if o.get(field) == id]:
+                self.delete(dependent, dependent_id)
+
+    def matches(self, endpoint: str, object: dict, key: str, values: list[str]) -> bool:
+        field, _, lookup = key.partition("__")
+        if field == "id" and lookup in ("gt", "gte", "lt", "lte"):
+            compare = {"gt": int.__gt__, "gte": int.__ge__, "lt": int.__lt__, "lte": int.__le__}[lookup]
+            return compare(object["id"], int(values[0]))
+        if field == "parent" and endpoint == "ipam/ip-addresses":
+            address = ip_interface(object["address"]).ip
+            return any(address in ip_network(v, strict=False) for v in values)
+        if field in ("within", "within_include", "contains") and endpoint == "ipam/prefixes":
+            own = ip_network(object["prefix"])
+            return any(self.prefix_matches(field, own, ip_network(v, strict=False)) for v in values)
+        if field.endswith("_id") and field[:-3] in FOREIGN_KEYS[endpoint]:
+            value = object.get(field[:-3])
+            ids = value if isinstance(value, list) else [value]
+            return any(str(id) in values for id in ids)
+        if (referenced := FOREIGN_KEYS[endpoint].get(field)) is not None:
+            nested = self.objects[referenced].get(object.get(field)) or {}
+            return any(v in (str(nested.get("id")), nested.get("name"), nested.get("slug")) for v in values)
+        value = object.get(field)
+        if isinstance(value, bool):
+            value = str(value).lower()
+        return str(value) in values
+
+    @staticmethod
+    def prefix_matches(lookup: str, prefix: IPv4Network | IPv6Network, other: IPv4Network | IPv6Network) -> bool:
+        """Return whether prefix is within (but not equal to), within or equal to, or contains other."""
+        if prefix.version != other.version:
+            return False
+        if lookup == "contains":
+            return other.subnet_of(prefix)  # type: ignore[arg-type]
+        return prefix.subnet_of(other) and (lookup == "within_include" or prefix != other)  # type: ignore[arg-type]
+
+    def filter(self, endpoint: str, params: dict[str, list[str]]) -> list[dict]:
+        objects = list(self.objects[endpoint].values())
+        for key, values in params.items():
+            if key not in PAGINATION_PARAMS:
+                objects = [object for object in objects if self.matches(endpoint, object, key, values)]
+        if ordering := params.get("ordering", ["id"])[0]:
+            field = ordering.lstrip("-")
+            objects.sort(key=lambda o: (o.get(field) is None, o.get(field)), reverse=ordering.startswith("-"))
+        return objects
+
+    def used_ranges(self, parent: IPv4Network | IPv6Network, endpoint: str) -> list[tuple[int, int]]:
+        key = "address" if endpoint == "ipam/ip-addresses" else "prefix"
+        ranges = []
+        for object in self.objects[endpoint].values():
+            network = ip_interface(object[key]).network if endpoint == "ipam/prefixes" else None
+            if network is None:
+                address = ip_interface(object[key]).ip
+                if address.version == parent.version and address in parent:
+                    ranges.append((int(address), int(address)))
+            elif network.version == parent.version and network != parent and network.subnet_of(parent):  # type: ignore
+                ranges.append((int(network.network_address), int(network.broadcast_address)))
+        return sorted(ranges)
+
+    def available_ips(self, prefix: dict) -> Iterator[str]:
+        """Yield the free addresses of prefix in order, with the same rules as NetBox."""
+        parent = ip_network(prefix["prefix"])
+        first, last = int(parent.network_address), int(parent.broadcast_address)
+        point_to_point = parent.prefixlen >= parent.max_prefixlen - 1
+        if parent.version == 4 and not prefix.get("is_pool") and not point_to_point:
+            first, last = first + 1, last - 1
+        candidate = first
+        for start, end in self.used_ranges(parent, "ipam/ip-addresses") + [(last + 1, last + 1)]:
+            while candidate < start and candidate <= last:
+                yield f"{ip_address(candidate)}/{parent.prefixlen}"
+                candidate += 1
+            candidate = max(candidate, end + 1)
+
+    def available_prefixes(self, prefix: dict, prefix_length: int | None = None) -> Iterator[str]:
+        """Yield the free blocks of prefix, or the free aligned subnets of prefix_length when given."""
+        parent = ip_network(prefix["prefix"])
+        last = int(parent.broadcast_address)
+        candidate = int(parent.network_address)
+        for start, end in self.used_ranges(parent, "ipam/prefixes") + [(last + 1, last + 1)]:
+            if prefix_length is None:
+                if candidate < start:
+                    first_ip, last_ip = ip_address(candidate), ip_address(min(start - 1, last))
+                    yield from (str(network) for network in summarize_address_range(first_ip, last_ip))
+            else:
+                size = 1 << (parent.max_prefixlen - prefix_length)
+                candidate = -(-candidate // size) * size  # align up
+                while candidate + size - 1 < start and candidate + size - 1 <= last:
+                    yield f"{ip_address(candidate)}/{prefix_length}"
+                    candidate += size
+            candidate = max(candidate, end + 1)
+
+
+class FakeNetboxHandler(BaseHTTPRequestHandler):
+    server: "FakeNetboxServer"
+    protocol_version = "HTTP/1.1"  # keep-alive, like a real NetBox behind a web server
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def do_PATCH(self) -> None:
+        self.handle_request("PATCH")
+
+    def do_PUT(self) -> None:
+        self.handle_request("PATCH")
+
+    def do_DELETE(self) -> None:
+        self.handle_request("DELETE")
+
+    def handle_request(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        self.server.delay()
+        try:
+            with self.server.store.lock:
+                status, response = self.dispatch(method, url.path, params, body)
+        except FakeNetboxError as exc:
+            status, response = exc.status, exc.body
+        except (KeyError, TypeError, ValueError) as exc:
+            status, response = HTTPStatus.BAD_REQUEST, {"detail": str(exc)}
+        self.send_json(status, response)
+
+    def send_json(self, status: HTTPStatus, response: Any) -> None:
+        content = b"" if response is None else json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("API-Version", API_VERSION)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def dispatch(self, method: str, path: str, params: dict, body: Any) -> tuple[HTTPStatus, Any]:
+        store = self.server.store
+        if path in ("/api/", "/api"):
+            return HTTPStatus.OK, {app: f"{store.base_url}/api/{app}/" for app in ("dcim", "ipam", "vpn")}
+        if path == "/api/status/":
+            return HTTPStatus.OK, {"netbox-version": f"{API_VERSION}.0"}
+        if not (match := _PATH.match(path)) or (endpoint := match["endpoint"]) not in FOREIGN_KEYS:
+            raise FakeNetboxError(HTTPStatus.NOT_FOUND, {"detail": "Not found."})
+
+        id = int(match["id"]) if match["id"] else None
+        if match["detail"]:
+            return self.dispatch_available(method, match["detail"], store.objects[endpoint].get(id or 0), params, body)
+
+        match method, id:
+            case "GET", None:
+                return HTTPStatus.OK, self.paginate(endpoint, store.filter(endpoint, params), params)
+            case "GET", _:
+                if (object := store.objects[endpoint].get(id)) is None:
+                    raise FakeNetboxError(HTTPStatus.NOT_FOUND, {"detail": "No object matches the given query."})
+                return HTTPStatus.OK, store.serialize(endpoint, object)
+            case "POST", None:
+                return HTTPStatus.CREATED, self.for_each(body, lambda data: store.create(endpoint, data), endpoint)
+            case "PATCH", None:
+                updated = self.for_each(body, lambda data: store.update(endpoint, data["id"], data), endpoint)
+                return HTTPStatus.OK, updated
+            case "PATCH", _:
+                return HTTPStatus.OK, store.serialize(endpoint, store.update(endpoint, id, body))
+            case "DELETE", None:
+                for data in body:
+                    store.delete(endpoint, data["id"])
+                return HTTPStatus.NO_CONTENT, None
+            case "DELETE", _:
+                store.delete(endpoint, id)
+                return HTTPStatus.NO_CONTENT, None
+        raise FakeNetboxError(HTTPStatus.METHOD_NOT_ALLOWED, {"detail": f'Method "{method}" not allowed.'})
+
+    def dispatch_available(
+        self, method: str, detail: str, prefix: dict | None, params: dict, body: Any
+    ) -> tuple[HTTPStatus, Any]:
+        store = self.server.store
+        if prefix is None:
+            raise FakeNetboxError(HTTPStatus.NOT_FOUND, {"detail": "No object matches the given query."})
+
+        if detail == "available-ips/":
+            if method == "GET":
+                limit = int(params.get("limit", [DEFAULT_PAGE_SIZE])[0]) or MAX_PAGE_SIZE
+                addresses = store.available_ips(prefix)
+                return HTTPStatus.OK, [
+                    {"family": ip_interface(address).version, "address": address, "vrf": None}
+                    for address, _ in zip(addresses, range(limit))
+                ]
+
+            def create_ip(data: dict) -> dict:
+                if (address := next(store.available_ips(prefix), None)) is None:
+                    raise FakeNetboxError(HTTPStatus.CONFLICT, {"detail": "Insufficient space is available"})
+                return store.create("ipam/ip-addresses", data | {"address": address})
+
+            return HTTPStatus.CREATED, self.for_each(body, create_ip, "ipam/ip-addresses")
+
+        if method == "GET":
+            prefixes = store.available_prefixes(prefix)
+            return HTTPStatus.OK, [{"family": ip_network(p).version, "prefix": p, "vrf": None} for p in prefixes]
+
+        def create_prefix(data: dict) -> dict:
+            if (free := next(store.available_prefixes(prefix, data["prefix_length"]), None)) is None:
+                raise FakeNetboxError(HTTPStatus.CONFLICT, {"detail": "Insufficient space is available"})
+            data = {k: v for k, v in data.items() if k != "prefix_length"}
+            return store.create("ipam/prefixes", data | {"prefix": free})
+
+        return HTTPStatus.CREATED, self.for_each(body, create_prefix, "ipam/prefixes")
+
+    def for_each(self, body: dict | list[dict], operation: Any, endpoint: str) -> dict | list[dict]:
+        """Apply operation to a single object or, atomically like NetBox, to a list of objects."""
+        store = self.server.store
+        if isinstance(body, dict):
+            return store.serialize(endpoint, operation(body))
+
+        snapshot = {e: dict(objects) for e, objects in store.objects.items()}, dict(store.last_id)
+        try:
+            return [store.serialize(endpoint, operation(data)) for data in body]
+        except FakeNetboxError:
+            store.objects, store.last_id = snapshot
+            raise
+
+    def paginate(self, endpoint: str, objects: list[dict], params: dict) -> dict:
+        store = self.server.store
+        limit = min(int(params.get("limit", [DEFAULT_PAGE_SIZE])[0]) or MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+        offset = int(params.get("offset", [0])[0])
+
+        def page_url(page_offset: int) -> str:
+            query = {k: v for k, v in params.items() if k not in ("limit", "offset")}
+            query |= {"limit": [limit], "offset": [page_offset]}
+            return f"{store.base_url}/api/{endpoint}/?{urlencode(query, doseq=True)}"
+
+        return {
+            "count": len(objects),
+            "next": page_url(offset + limit) if offset + limit < len(objects) else None,
+            "previous": page_url(max(offset - limit, 0)) if offset else None,
+            "results": [store.serialize(endpoint, object) for object in objects[offset : offset + limit]],
+        }
+
+
+class FakeNetboxServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], latency: float = 0.0, jitter: float = 0.0) -> None:
+        super().__init__(address, FakeNetboxHandler)
+        self.store = FakeNetboxStore()
+        self.latency = latency
+        self.jitter = jitter
+        host, port = self.server_address[:2]
+        self.store.base_url = f"http://{host}:{port}"
+
+    def delay(self) -> None:
+        if self.latency or self.jitter:
+            sleep(self.latency + uniform(0, self.jitter))
+
+
+class FakeNetbox:
+    """Run a :class:`FakeNetboxServer` in a background thread, usable as context manager.
+
+    Args:
+        host: address to bind to.
+        port: port to bind to, 0 selects a free port.
+        latency: seconds added to every request.
+        jitter: maximum number of random seconds added to the latency.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0) -> None:
+        self.server = FakeNetboxServer((host, port), latency=latency, jitter=jitter)
+        self.thread = Thread(target=self.server.serve_forever, name="fake-netbox", daemon=True)
+
+    @property
+    def url(self) -> str:
+        return self.server.store.base_url
+
+    @property
+    def store(self) -> FakeNetboxStore:
+        return self.server.store
+
+    def object_counts(self) -> dict[str, int]:
+        return {endpoint: len(objects) for endpoint, objects in self.store.objects.items()}
+
+    def start(self) -> "FakeNetbox":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeNetbox":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-memory stand-in for the NetBox REST API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="maximum random seconds added to the latency")
+    args = parser.parse_args()
+
+    server = FakeNetboxServer((args.host, args.port), latency=args.latency, jitter=args.jitter)
+    print(f"Fake NetBox listening on {server.store.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+
+
+class IntervalSet:
+    """Set of integers stored as sorted, disjoint and non-adjacent closed intervals.
+
+    Membership tests and finding the first integer that is not in the set take O(log n) for n intervals, which stays
+    small when the members are mostly consecutive, like the allocated addresses of an IP prefix.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        for start, end in intervals:
+            self.add(start, end)
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self._starts, value) - 1
+        return i >= 0 and self._ends[i] >= value
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self._starts, self._ends)
+
+    def __len__(self) -> int:
+        """Return the number of intervals."""
+        return len(self._starts)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
+
+    def count(self) -> int:
+        """Return the number of integers in the set."""
+        return sum(end - start + 1 for start, end in self)
+
+    def add(self, start: int, end: int | None = None) -> None:
+        """Add the integers start up to and including end (defaults to start) to the set."""
+        end = start if end is None else end
+        lo = bisect_left(self._ends, start - 1)
+        hi = bisect_right(self._starts, end + 1)
+        if lo < hi:
+            start, end = min(start, self._starts[lo]), max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def remove(self, start: int, end: int | None = None) -> None:
+        """Remove the integers start up to and including end (defaults to start) from the set."""
+        end = start if end is None else end
+        lo = bisect_left(self._ends, start)
+        hi = bisect_right(self._starts, end)
+        if lo >= hi:
+            return
+        remaining = []
+        if self._starts[lo] < start:
+            remaining.append((self._starts[lo], start - 1))
+        if self._ends[hi - 1] > end:
+            remaining.append((end + 1, self._ends[hi - 1]))
+        self._starts[lo:hi] = [start for start, _ in remaining]
+        self._ends[lo:hi] = [end for _, end in remaining]
+
+    def first_free(self, lo: int, hi: int) -> int | None:
+        """Return the lowest integer in [lo, hi] that is not in the set, or None if there is none."""
+        i = bisect_right(self._starts, lo) - 1
+        candidate = self._ends[i] + 1 if i >= 0 and self._ends[i] >= lo else lo
+        return candidate if candidate <= hi else None
+
+    def gaps(self, lo: int, hi: int) -> Iterator[tuple[int, int]]:
+        """Yield the intervals within [lo, hi] that are not in the set, in ascending order."""
+        candidate = lo
+        for i in range(max(bisect_right(self._starts, lo) - 1, 0), len(self._starts)):
+            start, end = self._starts[i], self._ends[i]
+            if start > hi:
+                break
+            if start > candidate:
+                yield candidate, start - 1
+            candidate = max(candidate, end + 1)
+        if candidate <= hi:
+            yield candidate, hi
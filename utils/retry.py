@@ -0,0 +1,122 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from dataclasses import dataclass, field
+from random import uniform
+from threading import Lock
+from time import monotonic
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"})
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+NOT_PROCESSED_STATUS_CODES = frozenset({429})  # the server did not act on the request
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service while its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fail fast while a service is down.
+
+    The circuit opens after failure_threshold consecutive failed calls. While open, calls fail immediately with
+    :class:`CircuitOpenError`. After reset_timeout seconds calls are let through again, the first successful call
+    closes the circuit and a failed call opens it for another reset_timeout seconds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._lock = Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None and monotonic() - self.opened_at < self.reset_timeout
+
+    def check(self) -> None:
+        if self.is_open:
+            raise CircuitOpenError(f"circuit breaker for {self.name} is open, not sending request")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info("Circuit breaker closed", name=self.name)
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if not self.is_open:
+                    logger.warning("Circuit breaker opened", name=self.name, failures=self.failures)
+                self.opened_at = monotonic()
+
+
+@dataclass
+class RetryPolicy:
+    """Retry budget with exponential backoff and full jitter.
+
+    Requests with idempotent methods are retried on connection errors and on RETRY_STATUS_CODES. Other requests
+    (POST) are only retried when it is certain that the server did not process them: when the connection could not
+    be established, or on NOT_PROCESSED_STATUS_CODES.
+    """
+
+    total: int
+    backoff_factor: float
+    backoff_max: float
+
+    def should_retry(self, method: str, retries: int, status: int | None = None, connect_error: bool = False) -> bool:
+        if retries >= self.total:
+            return False
+        if method.upper() in IDEMPOTENT_METHODS:
+            return status is None or status in RETRY_STATUS_CODES
+        return connect_error or status in NOT_PROCESSED_STATUS_CODES
+
+    def backoff(self, retries: int) -> float:
+        """Return the number of seconds to wait before retry number retries (starting at 1)."""
+        return uniform(0, min(self.backoff_max, self.backoff_factor * 2 ** (retries - 1)))
+
+
+@dataclass
+class RetryStats:
+    """Thread safe counters of the number of retries per call."""
+
+    calls: int = 0
+    retried_calls: int = 0
+    retries: int = 0
+    max_retries: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def record(self, retries: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.retries += retries
+            self.retried_calls += bool(retries)
+            self.max_retries = max(self.max_retries, retries)
+
+    def as_dict(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retried_calls": self.retried_calls,
+                "retries": self.retries,
+                "max_retries": self.max_retries,
+            }
@@ -0,0 +1,98 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""VLAN sets stored as bitsets, to combine the VLANs of many SAPs without parsing or merging ranges."""
+
+from collections.abc import Iterable, Iterator
+
+
+class VlanBitset:
+    """Set of VLAN IDs 0-4095 stored as the bits of a single integer.
+
+    Membership is a bit test, and union, intersection and difference are single integer operations that work on a
+    machine word at a time, so combining the VLANs of many SAPs does not parse or merge any ranges. Convert from and
+    to ``VlanRanges`` with ``VlanBitset.from_ranges(vlans.to_list_of_tuples())`` and ``VlanRanges(str(bitset))``.
+    """
+
+    SIZE = 4096
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0) -> None:
+        if not 0 <= bits < 1 << self.SIZE:
+            raise ValueError(f"VLAN bitset must be within 0-{self.SIZE - 1}")
+        self.bits = bits
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[tuple[int, int]]) -> "VlanBitset":
+        """Return the set of the VLANs in the inclusive (start, end) ranges."""
+        bits = 0
+        for start, end in ranges:
+            bits |= ((1 << (end - start + 1)) - 1) << start
+        return cls(bits)
+
+    @classmethod
+    def from_string(cls, value: str) -> "VlanBitset":
+        """Return the set of the VLANs in value, in the stored form of VLAN ranges like ``10-20,30``."""
+        ranges = []
+        for part in value.replace(" ", "").split(","):
+            if part:
+                start, _, end = part.partition("-")
+                ranges.append((int(start), int(end or start)))
+        return cls.from_ranges(ranges)
+
+    def ranges(self) -> Iterator[tuple[int, int]]:
+        """Yield the VLANs as sorted, merged, inclusive (start, end) ranges."""
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            carried = bits + lowest  # clears the lowest run of ones and sets the bit above it
+            above = carried & -carried
+            yield lowest.bit_length() - 1, above.bit_length() - 2
+            bits = carried ^ above
+
+    def __str__(self) -> str:
+        return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in self.ranges())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}.from_string({str(self)!r})"
+
+    def __contains__(self, vlan: int) -> bool:
+        return 0 <= vlan < self.SIZE and bool(self.bits >> vlan & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.ranges():
+            yield from range(start, end + 1)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, VlanBitset) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __or__(self, other: "VlanBitset") -> "VlanBitset":
+        return VlanBitset(self.bits | other.bits)
+
+    def __and__(self, other: "VlanBitset") -> "VlanBitset":
+        return VlanBitset(self.bits & other.bits)
+
+    def __sub__(self, other: "VlanBitset") -> "VlanBitset":
+        return VlanBitset(self.bits & ~other.bits)
+
+    def issubset(self, other: "VlanBitset") -> bool:
+        return self.bits & ~other.bits == 0
@@ -55,3 +55,7 @@ LazyWorkflowInstance("workflows.nsip2p.validate_nsip2p", "validate_nsip2p")
 LazyWorkflowInstance("workflows.tasks.bootstrap_netbox", "task_bootstrap_netbox")
 LazyWorkflowInstance("workflows.tasks.wipe_netbox", "task_wipe_netbox")
 LazyWorkflowInstance("workflows.tasks.showcase", "task_showcase")
+LazyWorkflowInstance("workflows.tasks.ipam_utilisation", "task_ipam_utilisation")
+LazyWorkflowInstance("workflows.tasks.reclaim_ipam", "task_reclaim_ipam")
+LazyWorkflowInstance("workflows.tasks.rebuild_vlan_occupancy", "task_rebuild_vlan_occupancy")
+LazyWorkflowInstance("workflows.tasks.scan_vlan_conflicts", "task_scan_vlan_conflicts")
@@ -31,9 +31,8 @@ from products.services.description import description
 from products.services.netbox.netbox import build_payload
 from pydantic_forms.types import FormGenerator, State, UUIDstr
 from pydantic_forms.validators import Choice
-from services import netbox
+from services import ipam, netbox
 from services.lso_client import execute_playbook, lso_interaction
-from settings import settings
 from workflows.shared import customer_selector, free_port_selector, node_selector
 
 
@@ -124,35 +123,55 @@ def construct_core_link_model(
 
 @step("Assign IPv6 prefix")
 def assign_ipv6_prefix(subscription: CoreLinkProvisioning) -> State:
-    parent_prefix_ipv6 = netbox.get_ip_prefix(prefix=settings.IPv6_CORE_LINK_PREFIX)
-    prefix_ipv6 = netbox.create_available_prefix(
-        parent_id=parent_prefix_ipv6.id,
-        payload=netbox.AvailablePrefixPayload(
-            prefix_length=127,
-            description=description(subscription),
-        ),
+    """Claim a /127 from the core link prefix pool together with the addresses of both sides."""
+    ports = subscription.core_link.ports
+    claimed = ipam.get_core_link_prefix_pool().claim(
+        description=description(subscription),
+        assignments=[(port.ims_id, description(port)) for port in ports],
     )
-    subscription.core_link.ipv6_prefix_ipam_id = prefix_ipv6.id
+    subscription.core_link.ipv6_prefix_ipam_id = claimed.id
+    ports[0].ipv6_ipam_id, ports[1].ipv6_ipam_id = claimed.address_ids
 
-    return {"subscription": subscription, "prefix_ipv6": prefix_ipv6.prefix}
+    return {
+        "subscription": subscription,
+        "prefix_ipv6": claimed.prefix,
+        "a_side_ipv6": claimed.addresses[0],
+        "b_side_ipv6": claimed.addresses[1],
+    }
 
 
 @step("Assign side A IPv6 address")
 def assign_side_a_ipv6_prefix(subscription: CoreLinkProvisioning) -> State:
-    a_side_ipv6 = netbox.create_available_ip(
+    """Reserve the addresses of both sides with one request, when not already assigned together with the prefix.
+
+    The addresses are now assigned together with the prefix, so this is a no-op for new processes. The step is only
+    kept for processes that were already in flight before that change.
+    """
+    ports = subscription.core_link.ports
+    if ports[0].ipv6_ipam_id:
+        return {"subscription": subscription}
+
+    a_side_ipv6, b_side_ipv6 = netbox.create_available_ips(
         parent_id=subscription.core_link.ipv6_prefix_ipam_id,
-        payload=netbox.AvailableIpPayload(
-            assigned_object_id=subscription.core_link.ports[0].ims_id,
-            description=description(subscription.core_link.ports[0]),
-        ),
+        payloads=[
+            netbox.AvailableIpPayload(assigned_object_id=port.ims_id, description=description(port)) for port in ports
+        ],
     )
-    subscription.core_link.ports[0].ipv6_ipam_id = a_side_ipv6.id
+    ports[0].ipv6_ipam_id, ports[1].ipv6_ipam_id = a_side_ipv6.id, b_side_ipv6.id
 
-    return {"subscription": subscription, "a_side_ipv6": a_side_ipv6.address}
+    return {"subscription": subscription, "a_side_ipv6": a_side_ipv6.address, "b_side_ipv6": b_side_ipv6.address}
 
 
 @step("Assign side B IPv6 address")
 def assign_side_b_ipv6_prefix(subscription: CoreLinkProvisioning) -> State:
+    """Reserve the address of side B, when not already assigned together with side A or the prefix.
+
+    The addresses are now assigned together with the prefix, so this is a no-op for new processes. The step is only
+    kept for processes that were already in flight before that change.
+    """
+    if subscription.core_link.ports[1].ipv6_ipam_id:  # already assigned together with side A
+        return {"subscription": subscription}
+
     b_side_ipv6 = netbox.create_available_ip(
         parent_id=subscription.core_link.ipv6_prefix_ipam_id,
         payload=netbox.AvailableIpPayload(
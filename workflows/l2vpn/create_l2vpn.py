@@ -30,15 +30,19 @@ from products.product_types.l2vpn import L2vpnInactive, L2vpnProvisioning
 from products.product_types.port import Port
 from products.services.description import description
 from pydantic_forms.types import FormGenerator, State, UUIDstr
-from pydantic_forms.validators import Choice
+from pydantic_forms.validators import Choice, read_only_list
 from workflows.l2vpn.shared.forms import ports_selector
 from workflows.shared import (
     AllowedNumberOfL2vpnPorts,
+    VlanFormPage,
     create_l2vpn_in_netbox,
     create_l2vpn_terminations_in_netbox,
     create_saps_in_netbox,
     customer_selector,
+    find_free_vlans,
+    lowest_free_vlans,
     update_ports_in_netbox,
+    update_vlan_occupancy,
     validate_vlan,
     validate_vlan_not_in_use,
 )
@@ -67,17 +71,24 @@ def initial_input_form_generator(product_name: str) -> FormGenerator:
         model_config = ConfigDict(title=product_name)
 
         ports: PortsChoiceList
+
+    select_ports = yield SelectPortsForm
+    ports = [str(item) for item in select_ports.model_dump()["ports"]]
+    suggested_vlan = lowest_free_vlans(find_free_vlans(ports)) or VlanRanges(0)
+
+    class SelectVlanForm(VlanFormPage):
+        model_config = ConfigDict(title=product_name)
+
+        ports: read_only_list(ports)  # type: ignore[valid-type]
         vlan: Annotated[
             VlanRanges,
             AfterValidator(validate_vlan),
             AfterValidator(_validate_vlan_not_in_use),
-        ] = VlanRanges(0)
+        ] = suggested_vlan
 
-    select_ports = yield SelectPortsForm
-    select_ports_dict = select_ports.model_dump()
-    ports = [str(item) for item in select_ports_dict["ports"]]
+    select_vlan = yield SelectVlanForm
 
-    return user_input_dict | select_ports_dict | {"ports": ports}
+    return user_input_dict | select_vlan.model_dump() | {"ports": ports}
 
 
 @step("Construct Subscription model")
@@ -173,6 +184,7 @@ def create_l2vpn() -> StepList:
         begin
         >> construct_l2vpn_model
         >> store_process_subscription()
+        >> update_vlan_occupancy
         >> ims_create_vlans
         >> ims_create_l2vpn
         >> ims_create_l2vpn_terminations
@@ -19,7 +19,7 @@ from orchestrator.core.workflows.utils import ensure_provisioning_status, modify
 from products.product_types.l2vpn import L2vpn, L2vpnProvisioning
 from products.services.description import description
 from pydantic_forms.types import FormGenerator, State, UUIDstr
-from workflows.shared import modify_summary_form
+from workflows.shared import modify_summary_form, update_vlan_occupancy
 
 
 def initial_input_form_generator(subscription_id: UUIDstr) -> FormGenerator:
@@ -65,9 +65,9 @@ update_l2vpn_in_external_systems = begin >> update_l2vpn_in_nrm
 
 @modify_workflow(initial_input_form=initial_input_form_generator)
 def modify_l2vpn() -> StepList:
-    return begin >> update_subscription >> update_l2vpn_in_external_systems
+    return begin >> update_subscription >> update_vlan_occupancy >> update_l2vpn_in_external_systems
 
 
 @reconcile_workflow()
 def reconcile_l2vpn() -> StepList:
-    return begin >> update_l2vpn_in_external_systems
+    return begin >> update_vlan_occupancy >> update_l2vpn_in_external_systems
@@ -19,7 +19,7 @@ from orchestrator.core.workflows.utils import terminate_workflow
 from products.product_types.l2vpn import L2vpn
 from pydantic_forms.types import InputForm, UUIDstr
 from pydantic_forms.validators import DisplaySubscription
-from workflows.shared import remove_l2vpn_in_netbox, remove_saps_in_netbox
+from workflows.shared import remove_l2vpn_in_netbox, remove_saps_in_netbox, remove_vlan_occupancy
 
 
 def terminate_initial_input_form_generator(subscription_id: UUIDstr) -> InputForm:
@@ -50,4 +50,4 @@ def ims_remove_vlans(subscription: L2vpn) -> None:
 
 @terminate_workflow(initial_input_form=terminate_initial_input_form_generator)
 def terminate_l2vpn() -> StepList:
-    return begin >> ims_remove_l2vpn >> ims_remove_vlans
+    return begin >> ims_remove_l2vpn >> ims_remove_vlans >> remove_vlan_occupancy
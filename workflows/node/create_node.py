@@ -32,7 +32,7 @@ from products.services.netbox.netbox import build_payload
 from pydantic_forms.types import FormGenerator, State, UUIDstr
 from pydantic_forms.validators import Choice, Label, callout
 from pydantic_forms.validators.components.callout import CalloutMessageType
-from services import netbox
+from services import ipam, netbox
 from services.lso_client import execute_playbook, lso_interaction
 from workflows.node.shared.forms import NodeStatusChoice, node_role_selector, node_type_selector, site_selector
 from workflows.node.shared.steps import if_auto_add_ifaces, update_interfaces, update_node_in_ims
@@ -122,7 +122,7 @@ def create_node_in_ims(subscription: NodeProvisioning) -> State:
 
 @step("Reserve loopback addresses")
 def reserve_loopback_addresses(subscription: NodeProvisioning) -> State:
-    subscription.node.ipv4_ipam_id, subscription.node.ipv6_ipam_id = netbox.reserve_loopback_addresses(
+    subscription.node.ipv4_ipam_id, subscription.node.ipv6_ipam_id = ipam.reserve_loopback_addresses(
         subscription.node.ims_id
     )
     return {"subscription": subscription}
@@ -21,6 +21,7 @@ from orchestrator.core.workflows.utils import ensure_provisioning_status, modify
 from products.product_blocks.shared.types import NodeStatus
 from products.product_types.node import Node, NodeProvisioning
 from products.services.description import description
+from products.services.netbox.netbox import build_payload
 from pydantic_forms.types import FormGenerator, State, UUIDstr
 from pydantic_forms.validators import Choice, Label
 from workflows.node.shared.forms import NodeStatusChoice, node_role_selector, node_type_selector, site_selector
@@ -70,6 +71,7 @@ def update_subscription(
     node_name: str,
     node_description: str | None,
 ) -> State:
+    previous_payload = build_payload(subscription.node, subscription)
     subscription.node.role_id = role_id
     subscription.node.type_id = type_id
     subscription.node.site_id = site_id
@@ -78,7 +80,7 @@ def update_subscription(
     subscription.node.node_description = node_description
     subscription.description = description(subscription)
 
-    return {"subscription": subscription}
+    return {"subscription": subscription, "previous_payload": previous_payload.dict()}
 
 
 @step("Update node in NRM")
@@ -24,10 +24,11 @@ if_auto_add_ifaces: Callable[..., StepList] = conditional(lambda state: state[_C
 
 
 @step("Update node in IMS")
-def update_node_in_ims(subscription: Node) -> State:
-    """Update node in IMDB"""
+def update_node_in_ims(subscription: Node, previous_payload: dict | None = None) -> State:
+    """Update node in IMDB, only the fields that differ from previous_payload when it is known."""
     payload = build_payload(subscription.node, subscription)
-    netbox.update(payload, id=subscription.node.ims_id)
+    previous = netbox.DevicePayload(**previous_payload) if previous_payload else None
+    netbox.update(payload, id=subscription.node.ims_id, previous=previous)
     return {"subscription": subscription, "payload": payload.dict()}
 
 
@@ -30,14 +30,18 @@ from products.product_types.nsip2p import Nsip2pInactive, Nsip2pProvisioning
 from products.product_types.port import Port
 from products.services.description import description
 from pydantic_forms.types import FormGenerator, State, UUIDstr
-from pydantic_forms.validators import Choice
+from pydantic_forms.validators import Choice, read_only_list
 from workflows.l2vpn.shared.forms import ports_selector
 from workflows.shared import (
+    VlanFormPage,
     create_l2vpn_in_netbox,
     create_l2vpn_terminations_in_netbox,
     create_saps_in_netbox,
     customer_selector,
+    find_free_vlans,
+    lowest_free_vlans,
     update_ports_in_netbox,
+    update_vlan_occupancy,
     validate_vlan,
     validate_vlan_not_used_by_product,
     validate_vlan_reserved_by_product,
@@ -78,6 +82,15 @@ def initial_input_form_generator(product_name: str) -> FormGenerator:
     class SelectPortsForm(FormPage):
         model_config = ConfigDict(title=product_name)
         ports: PortsChoiceList
+
+    select_ports = yield SelectPortsForm
+    ports = [str(item) for item in select_ports.model_dump()["ports"]]
+    free_vlans = find_free_vlans(ports, product_type="Nsip2p", reserved_by_product_type="Nsistp")
+    suggested_vlan = lowest_free_vlans(free_vlans) or VlanRanges(0)
+
+    class SelectVlanForm(VlanFormPage):
+        model_config = ConfigDict(title=product_name)
+        ports: read_only_list(ports)  # type: ignore[valid-type]
         # Only one VLAN per port, but stored as VlanRanges for compatibility
         vlan: Annotated[
             VlanRanges,
@@ -85,13 +98,11 @@ def initial_input_form_generator(product_name: str) -> FormGenerator:
             AfterValidator(validate_single_vlan),
             AfterValidator(_validate_vlan_reserved_by_nsistp),
             AfterValidator(_validate_vlan_not_used_by_nsip2p),
-        ] = VlanRanges(0)
+        ] = suggested_vlan
 
-    select_ports = yield SelectPortsForm
-    select_ports_dict = select_ports.model_dump()
-    ports = [str(item) for item in select_ports_dict["ports"]]
+    select_vlan = yield SelectVlanForm
 
-    return user_input_dict | select_ports_dict | {"ports": ports}
+    return user_input_dict | select_vlan.model_dump() | {"ports": ports}
 
 
 @step("Construct NSIP2P Subscription model")
@@ -184,6 +195,7 @@ def create_nsip2p() -> StepList:
         begin
         >> construct_nsip2p_model
         >> store_process_subscription()
+        >> update_vlan_occupancy
         >> ims_create_vlans
         >> ims_create_nsip2p
         >> ims_create_nsip2p_terminations
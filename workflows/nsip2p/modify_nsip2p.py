@@ -18,7 +18,7 @@ from orchestrator.core.workflows.utils import ensure_provisioning_status, modify
 from products.product_types.nsip2p import Nsip2p, Nsip2pProvisioning
 from products.services.description import description
 from pydantic_forms.types import FormGenerator, State, UUIDstr
-from workflows.shared import modify_summary_form
+from workflows.shared import modify_summary_form, update_vlan_occupancy
 
 
 def initial_input_form_generator(subscription_id: UUIDstr) -> FormGenerator:
@@ -63,9 +63,9 @@ update_nsip2p_in_external_systems = begin >> update_nsip2p_in_nrm
 
 @modify_workflow(initial_input_form=initial_input_form_generator)
 def modify_nsip2p() -> StepList:
-    return begin >> update_subscription >> update_nsip2p_in_external_systems
+    return begin >> update_subscription >> update_vlan_occupancy >> update_nsip2p_in_external_systems
 
 
 @reconcile_workflow()
 def reconcile_nsip2p() -> StepList:
-    return begin >> update_nsip2p_in_external_systems
+    return begin >> update_vlan_occupancy >> update_nsip2p_in_external_systems
@@ -18,7 +18,7 @@ from orchestrator.core.workflows.utils import terminate_workflow
 
 from products import Nsip2p
 from pydantic_forms.types import InputForm, UUIDstr
-from workflows.shared import remove_l2vpn_in_netbox, remove_saps_in_netbox
+from workflows.shared import remove_l2vpn_in_netbox, remove_saps_in_netbox, remove_vlan_occupancy
 
 
 def terminate_initial_input_form_generator(subscription_id: UUIDstr, customer_id: UUIDstr) -> InputForm:
@@ -46,4 +46,4 @@ def ims_remove_vlans(subscription: Nsip2p) -> None:
 
 @terminate_workflow(initial_input_form=terminate_initial_input_form_generator)
 def terminate_nsip2p() -> StepList:
-    return begin >> ims_remove_nsip2p >> ims_remove_vlans
+    return begin >> ims_remove_nsip2p >> ims_remove_vlans >> remove_vlan_occupancy
@@ -28,7 +28,7 @@ from nwastdlib.vlans import VlanRanges
 from products.product_types.nsistp import NsistpInactive, NsistpProvisioning
 from products.services.description import description
 from pydantic_forms.types import FormGenerator, State, UUIDstr
-from pydantic_forms.validators import Choice
+from pydantic_forms.validators import Choice, read_only_field
 from workflows.nsistp.shared.forms import (
     IsAlias,
     ServiceSpeed,
@@ -39,7 +39,16 @@ from workflows.nsistp.shared.forms import (
     port_selector,
     validate_both_aliases_empty_or_not,
 )
-from workflows.shared import create_summary_form, customer_selector, validate_vlan, validate_vlan_not_in_use
+from workflows.shared import (
+    VlanFormPage,
+    create_summary_form,
+    customer_selector,
+    find_free_vlans,
+    lowest_free_vlans,
+    update_vlan_occupancy,
+    validate_vlan,
+    validate_vlan_not_in_use,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -49,19 +58,28 @@ def initial_input_form_generator(product_name: str) -> FormGenerator:
 
     _validate_vlan_not_in_use = partial(validate_vlan_not_in_use, port_field_name="port")
 
-    class CreateNsiStpForm(FormPage):
+    class SelectPortForm(FormPage):
         model_config = ConfigDict(title=product_name)
 
         customer_id: customer_selector()
 
+        port: PortChoiceList
+
+    select_port = yield SelectPortForm
+    select_port_dict = select_port.model_dump()
+    suggested_vlan = lowest_free_vlans(find_free_vlans([select_port_dict["port"]])) or VlanRanges(0)
+
+    class CreateNsiStpForm(VlanFormPage):
+        model_config = ConfigDict(title=product_name)
+
         nsistp_settings: Label
 
-        port: PortChoiceList
+        port: read_only_field(select_port_dict["port"])  # type: ignore[valid-type]
         vlan: Annotated[
             VlanRanges,
             AfterValidator(validate_vlan),
             AfterValidator(_validate_vlan_not_in_use),
-        ]
+        ] = suggested_vlan
 
         divider_1: Divider
 
@@ -79,7 +97,7 @@ def initial_input_form_generator(product_name: str) -> FormGenerator:
             return self
 
     user_input = yield CreateNsiStpForm
-    user_input_dict = user_input.dict()
+    user_input_dict = select_port_dict | user_input.dict()
 
     summary_fields = [
         "port",
@@ -139,4 +157,4 @@ def construct_nsistp_model(
 
 @create_workflow(initial_input_form=initial_input_form_generator)
 def create_nsistp() -> StepList:
-    return begin >> construct_nsistp_model >> store_process_subscription()
+    return begin >> construct_nsistp_model >> store_process_subscription() >> update_vlan_occupancy
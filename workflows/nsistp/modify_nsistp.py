@@ -23,7 +23,7 @@ from products.services.description import description
 from pydantic_forms.types import FormGenerator, State, UUIDstr
 from pydantic_forms.validators import read_only_field
 from workflows.nsistp.shared.forms import IsAlias, ServiceSpeed, StpDescription, Topology
-from workflows.shared import modify_summary_form
+from workflows.shared import modify_summary_form, update_vlan_occupancy
 
 logger = structlog.get_logger(__name__)
 
@@ -85,4 +85,4 @@ def update_subscription(
 
 @modify_workflow(initial_input_form=initial_input_form_generator)
 def modify_nsistp() -> StepList:
-    return begin >> update_subscription
+    return begin >> update_subscription >> update_vlan_occupancy
@@ -19,6 +19,7 @@ from orchestrator.core.workflow import StepList, begin
 from orchestrator.core.workflows.utils import terminate_workflow
 
 from pydantic_forms.types import InputForm, UUIDstr
+from workflows.shared import remove_vlan_occupancy
 
 logger = structlog.get_logger(__name__)
 
@@ -35,6 +36,6 @@ def terminate_initial_input_form_generator(subscription_id: UUIDstr, customer_id
 @terminate_workflow(initial_input_form=terminate_initial_input_form_generator)
 def terminate_nsistp() -> StepList:
     return (
-        begin
+        begin >> remove_vlan_occupancy
         # TODO: fill in additional steps if needed
     )
@@ -18,6 +18,7 @@ from orchestrator.core.workflows.utils import ensure_provisioning_status, modify
 
 from products.product_types.port import Port, PortProvisioning
 from products.services.description import description
+from products.services.netbox.netbox import build_payload
 from pydantic_forms.types import FormGenerator, State, UUIDstr
 from pydantic_forms.validators import Label, read_only_field
 from workflows.port.shared.steps import update_port_in_ims
@@ -58,12 +59,13 @@ def update_subscription(
     auto_negotiation: bool,
     lldp: bool,
 ) -> State:
+    previous_payload = build_payload(subscription.port, subscription)
     subscription.port.port_description = port_description
     subscription.port.auto_negotiation = auto_negotiation
     subscription.port.lldp = lldp
     subscription.description = description(subscription)
 
-    return {"subscription": subscription}
+    return {"subscription": subscription, "previous_payload": previous_payload.dict()}
 
 
 @step("Update port in NRM")
@@ -21,8 +21,9 @@ from services import netbox
 
 
 @step("Update port in IMS")
-def update_port_in_ims(subscription: Port) -> State:
-    """Update port in IMDB"""
+def update_port_in_ims(subscription: Port, previous_payload: dict | None = None) -> State:
+    """Update port in IMDB, only the fields that differ from previous_payload when it is known."""
     payload = build_payload(subscription.port, subscription)
-    netbox.update(payload, id=subscription.port.ims_id)
+    previous = netbox.InterfacePayload(**previous_payload) if previous_payload else None
+    netbox.update(payload, id=subscription.port.ims_id, previous=previous)
     return {"subscription": subscription, "payload": payload.dict()}
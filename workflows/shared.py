@@ -11,9 +11,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import operator
-from collections.abc import Iterator
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
 from pprint import pformat
-from typing import Annotated, Generator, List, TypeAlias, cast
+from typing import Annotated, Any, Generator, List, Self, TypeAlias, cast
 from uuid import UUID
 
 import structlog
@@ -31,14 +34,14 @@ from orchestrator.core.db import (
 from orchestrator.core.domain import SubscriptionModel
 from orchestrator.core.domain.base import ProductBlockModel
 from orchestrator.core.forms import FormPage
-from orchestrator.core.services import subscriptions
 from orchestrator.core.types import SubscriptionLifecycle
-from pydantic import ConfigDict
+from orchestrator.core.workflow import step
+from pydantic import ConfigDict, ModelWrapValidatorHandler, model_validator
 from pydantic_core.core_schema import ValidationInfo
-from sqlalchemy import select
+from sqlalchemy import Select, delete, insert, select
 from sqlalchemy.orm import aliased
 
-from db.models import CustomerTable
+from db.models import CustomerTable, PortVlanOccupancyTable
 from nwastdlib.vlans import VlanRanges
 from products import Port
 from products.product_blocks.sap import SAPBlock, SAPBlockProvisioning
@@ -50,10 +53,15 @@ from pydantic_forms.types import State, SummaryData, UUIDstr
 from pydantic_forms.validators import Choice, MigrationSummary, migration_summary
 from services import netbox
 from services.netbox import L2vpnTerminationPayload
+from utils.vlans import VlanBitset
 
 logger = structlog.get_logger(__name__)
 
-Vlan = Annotated[int, Ge(2), Le(4094), doc("VLAN ID.")]
+VLAN_MIN = 2
+VLAN_MAX = 4094
+FREE_VLANS = VlanBitset.from_ranges([(VLAN_MIN, VLAN_MAX)])
+
+Vlan = Annotated[int, Ge(VLAN_MIN), Le(VLAN_MAX), doc("VLAN ID.")]
 
 AllowedNumberOfL2vpnPorts = Annotated[int, Ge(2), Le(8), doc("Allowed number of L2vpn ports.")]
 
@@ -173,27 +181,27 @@ def validate_vlan(vlan: VlanRanges, info: ValidationInfo) -> VlanRanges:
 
     if vlan == VlanRanges(0):
         if subscription_id:
-            subscription = subscriptions.get_subscription(subscription_id, model=SubscriptionTable)
+            subscription = _get_subscription(subscription_id)
             raise ValueError(f"{subscription.product.tag} must have a vlan")
         raise ValueError("vlan must have a value")
 
     return vlan
 
 
-def _vlan_partially_in_vlan_range(vlan: int | VlanRanges, vlan_range: VlanRanges) -> bool:
+def _vlan_bitset(vlan: int | VlanRanges) -> VlanBitset:
     match vlan:
         case int():
-            return vlan in vlan_range
+            return VlanBitset.from_ranges([(vlan, vlan)])
         case VlanRanges():
-            return any(v in vlan_range for v in vlan)
+            return VlanBitset.from_ranges(vlan.to_list_of_tuples())
 
 
-def _vlan_completely_in_vlan_range(vlan: int | VlanRanges, vlan_range: VlanRanges) -> bool:
-    match vlan:
-        case int():
-            return vlan in vlan_range
-        case VlanRanges():
-            return all(v in vlan_range for v in vlan)
+def _vlan_partially_in_vlan_range(vlan: int | VlanRanges, vlan_range: VlanBitset) -> bool:
+    return bool(_vlan_bitset(vlan) & vlan_range)
+
+
+def _vlan_completely_in_vlan_range(vlan: int | VlanRanges, vlan_range: VlanBitset) -> bool:
+    return _vlan_bitset(vlan).issubset(vlan_range)
 
 
 def _get_subscription_ids_from_info(info: ValidationInfo, port_field_name: str) -> list[str] | None:
@@ -218,9 +226,9 @@ def validate_vlan_not_in_use(
     if not (subscription_ids := _get_subscription_ids_from_info(info, port_field_name)):
         return vlan
 
-    used_vlans = VlanRanges([])
-    for subscription_id in subscription_ids:
-        used_vlans |= find_allocated_vlans(subscription_id)
+    used_vlans = VlanBitset()
+    for allocated_vlans in find_allocated_vlans_by_port(subscription_ids).values():
+        used_vlans |= _vlan_bitset(allocated_vlans)
 
     if current:
         for subscription_id in subscription_ids:
@@ -230,60 +238,147 @@ def validate_vlan_not_in_use(
                 if not current_selected_vlan:
                     current_selected_vlan = "0"
 
-                current_selected_vlan_range = VlanRanges(current_selected_vlan)
-                used_vlans -= current_selected_vlan_range  # type: ignore[assignment]
+                used_vlans -= _vlan_bitset(VlanRanges(current_selected_vlan))
 
     if _vlan_partially_in_vlan_range(vlan, used_vlans):
-        raise ValueError(f"Vlan(s) {used_vlans} already in use")
+        free_vlans = list((FREE_VLANS - used_vlans).ranges())
+        raise ValueError(
+            f"Vlan(s) {used_vlans} already in use, lowest free vlan {lowest_free_vlans(free_vlans)}, "
+            f"largest free block {largest_free_vlan_block(free_vlans)}"
+        )
 
     return vlan
 
 
+_lookups: ContextVar[dict[Hashable, Any] | None] = ContextVar("vlan_lookups", default=None)
+
+
+@contextmanager
+def memoised_lookups() -> Iterator[None]:
+    """Memoise the VLAN and subscription lookups done within this context, a nested context shares the memo."""
+    if _lookups.get() is not None:
+        yield
+        return
+    token = _lookups.set({})
+    try:
+        yield
+    finally:
+        _lookups.reset(token)
+
+
+def _memoised_by_port(
+    key: Hashable,
+    subscription_ids: list[UUID | UUIDstr],
+    lookup: Callable[[list[UUID | UUIDstr]], dict[str, VlanRanges]],
+) -> dict[str, VlanRanges]:
+    """Return lookup(subscription_ids), only looking up the ports that were not looked up before with the same key."""
+    if (memo := _lookups.get()) is None:
+        return lookup(subscription_ids)
+    if missing := [subscription_id for subscription_id in subscription_ids if (key, str(subscription_id)) not in memo]:
+        for subscription_id, vlans in lookup(missing).items():
+            memo[key, subscription_id] = vlans
+    return {str(subscription_id): memo[key, str(subscription_id)] for subscription_id in subscription_ids}
+
+
+class VlanFormPage(FormPage):
+    """Form page that memoises the VLAN and subscription lookups of its validators, see :func:`memoised_lookups`.
+
+    The validators of a VLAN field and the model validators all run within one validation of the page, so the allocated
+    VLANs of a port are queried once per validation instead of once per validator.
+    """
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def memoise_lookups(cls, data: Any, handler: ModelWrapValidatorHandler[Self]) -> Self:
+        with memoised_lookups():
+            return handler(data)
+
+
+def _vlan_ranges_by_port(query: Select, subscription_ids: Iterable[UUID | UUIDstr]) -> dict[str, VlanRanges]:
+    """Execute query, that returns (port subscription id, vlan start, vlan end) rows, and merge the vlans per port."""
+    ranges_by_port: dict[str, list[str]] = {str(subscription_id): [] for subscription_id in subscription_ids}
+    for subscription_id, vlan_start, vlan_end in db.session.execute(query):
+        ranges_by_port[str(subscription_id)].append(f"{vlan_start}-{vlan_end}")
+    vlans_by_port = {port: VlanRanges(",".join(ranges)) for port, ranges in ranges_by_port.items()}
+    logger.debug("Found used VLAN values", vlans_by_port=vlans_by_port)
+    return vlans_by_port
+
+
+def find_allocated_vlans_by_port(subscription_ids: Iterable[UUID | UUIDstr]) -> dict[str, VlanRanges]:
+    """Find all vlans already allocated to a SAP for each of the given ports, with a single indexed query.
+
+    Returns:
+        The allocated vlans by port subscription id (as string), for every given port.
+    """
+    return _memoised_by_port("vlans", list(subscription_ids), _find_allocated_vlans_by_port)
+
+
+def _find_allocated_vlans_by_port(subscription_ids: list[UUID | UUIDstr]) -> dict[str, VlanRanges]:
+    logger.debug("Finding allocated VLANs", subscription_ids=subscription_ids)
+
+    query = select(
+        PortVlanOccupancyTable.port_subscription_id, PortVlanOccupancyTable.vlan_start, PortVlanOccupancyTable.vlan_end
+    ).where(PortVlanOccupancyTable.port_subscription_id.in_(subscription_ids))
+
+    return _vlan_ranges_by_port(query, subscription_ids)
+
+
 def find_allocated_vlans(subscription_id: UUID | UUIDstr) -> VlanRanges:
     """Find all vlans already allocated to a SAP for a given port."""
-    logger.debug("Finding allocated VLANs", subscription_id=subscription_id)
+    return find_allocated_vlans_by_port([subscription_id])[str(subscription_id)]
+
+
+def find_allocated_vlans_for_product_by_port(
+    subscription_ids: Iterable[UUID | UUIDstr], product_type: str
+) -> dict[str, VlanRanges]:
+    """Find VLANs allocated to SAPs filtered by product type (e.g. NSISTP or NSIP2P) for each port, with one query."""
+    return _memoised_by_port(
+        ("vlans", product_type),
+        list(subscription_ids),
+        partial(_find_allocated_vlans_for_product_by_port, product_type=product_type),
+    )
+
+
+def _find_allocated_vlans_for_product_by_port(
+    subscription_ids: list[UUID | UUIDstr], product_type: str
+) -> dict[str, VlanRanges]:
+    logger.debug("Finding allocated VLANs for product", subscription_ids=subscription_ids, product_type=product_type)
 
     query = (
-        select(SubscriptionInstanceValueTable.value)
-        .join(
-            ResourceTypeTable,
-            SubscriptionInstanceValueTable.resource_type_id == ResourceTypeTable.resource_type_id,
+        select(
+            PortVlanOccupancyTable.port_subscription_id,
+            PortVlanOccupancyTable.vlan_start,
+            PortVlanOccupancyTable.vlan_end,
         )
-        .join(
-            SubscriptionInstanceRelationTable,
-            SubscriptionInstanceValueTable.subscription_instance_id == SubscriptionInstanceRelationTable.in_use_by_id,
-        )
-        .join(
-            SubscriptionInstanceTable,
-            SubscriptionInstanceRelationTable.depends_on_id == SubscriptionInstanceTable.subscription_instance_id,
-        )
-        .filter(
-            SubscriptionInstanceTable.subscription_id == subscription_id,
-            ResourceTypeTable.resource_type == "vlan",
+        .join(SubscriptionTable, PortVlanOccupancyTable.subscription_id == SubscriptionTable.subscription_id)
+        .where(
+            PortVlanOccupancyTable.port_subscription_id.in_(subscription_ids),
+            PortVlanOccupancyTable.product_type == product_type,
+            SubscriptionTable.status.in_([SubscriptionLifecycle.PROVISIONING, SubscriptionLifecycle.ACTIVE]),
         )
     )
 
-    used_vlan_values = db.session.execute(query).scalars().all()
-
-    if not used_vlan_values:
-        logger.debug("No VLAN values in use found")
-        return VlanRanges([])
+    return _vlan_ranges_by_port(query, subscription_ids)
 
-    logger.debug("Found used VLAN values", values=used_vlan_values)
-    return VlanRanges(",".join(used_vlan_values))
 
+def sync_vlan_occupancy(subscription_ids: Iterable[UUID | UUIDstr] | None = None) -> int:
+    """Rederive the port VLAN occupancy of the given subscriptions, or of all subscriptions, from their SAPs.
 
-def find_allocated_vlans_for_product(subscription_id: UUID | UUIDstr, product_type: str) -> VlanRanges:
-    """Find VLANs allocated to SAPs on a port filtered by product type (e.g. NSISTP or NSIP2P)."""
-    logger.debug("Finding allocated VLANs for product", subscription_id=subscription_id, product_type=product_type)
-
+    Returns:
+        The number of VLAN ranges in the occupancy table for the synced subscriptions.
+    """
     port_si = aliased(SubscriptionInstanceTable)
     sap_si = aliased(SubscriptionInstanceTable)
     sap_sub = aliased(SubscriptionTable)
     sap_prod = aliased(ProductTable)
 
     query = (
-        select(SubscriptionInstanceValueTable.value)
+        select(
+            port_si.subscription_id,
+            sap_si.subscription_id,
+            sap_prod.product_type,
+            SubscriptionInstanceValueTable.value,
+        )
         .join(
             ResourceTypeTable,
             SubscriptionInstanceValueTable.resource_type_id == ResourceTypeTable.resource_type_id,
@@ -300,24 +395,123 @@ def find_allocated_vlans_for_product(subscription_id: UUID | UUIDstr, product_ty
             SubscriptionInstanceRelationTable.depends_on_id == port_si.subscription_instance_id,
         )
         .filter(
-            port_si.subscription_id == subscription_id,
             ResourceTypeTable.resource_type == "vlan",
-            sap_prod.product_type == product_type,
-            sap_sub.status.in_([SubscriptionLifecycle.PROVISIONING, SubscriptionLifecycle.ACTIVE]),
+            sap_sub.status != SubscriptionLifecycle.TERMINATED,
         )
     )
+    stale = delete(PortVlanOccupancyTable)
+    if subscription_ids is not None:
+        subscription_ids = list(subscription_ids)
+        query = query.filter(sap_si.subscription_id.in_(subscription_ids))
+        stale = stale.where(PortVlanOccupancyTable.subscription_id.in_(subscription_ids))
+
+    rows = [
+        {
+            "port_subscription_id": port_subscription_id,
+            "subscription_id": subscription_id,
+            "product_type": product_type,
+            "vlan_start": vlan_start,
+            "vlan_end": vlan_end,
+        }
+        for port_subscription_id, subscription_id, product_type, value in db.session.execute(query)
+        for vlan_start, vlan_end in VlanRanges(value).to_list_of_tuples()
+    ]
+    db.session.execute(stale)
+    if rows:
+        db.session.execute(insert(PortVlanOccupancyTable), rows)
+    logger.debug("Synced port VLAN occupancy", subscription_ids=subscription_ids, ranges=len(rows))
+    return len(rows)
+
+
+def delete_vlan_occupancy(subscription_id: UUID | UUIDstr) -> None:
+    """Release all VLANs that subscription occupies on its ports."""
+    db.session.execute(delete(PortVlanOccupancyTable).where(PortVlanOccupancyTable.subscription_id == subscription_id))
+
+
+@step("Update VLAN occupancy")
+def update_vlan_occupancy(subscription_id: UUIDstr) -> State:
+    return {"vlan_occupancy_ranges": sync_vlan_occupancy([subscription_id])}
+
+
+@step("Remove VLAN occupancy")
+def remove_vlan_occupancy(subscription_id: UUIDstr) -> State:
+    delete_vlan_occupancy(subscription_id)
+    return {}
+
+
+def find_allocated_vlans_for_product(subscription_id: UUID | UUIDstr, product_type: str) -> VlanRanges:
+    """Find VLANs allocated to SAPs on a port filtered by product type (e.g. NSISTP or NSIP2P)."""
+    return find_allocated_vlans_for_product_by_port([subscription_id], product_type)[str(subscription_id)]
 
-    values = db.session.execute(query).scalars().all()
-    if not values:
-        logger.debug("No VLAN values in use found for product", product_type=product_type)
-        return VlanRanges([])
 
-    logger.debug("Found VLAN values for product", values=values, product_type=product_type)
-    return VlanRanges(",".join(values))
+def free_vlan_ranges(used: Iterable[VlanRanges], reserved: Iterable[VlanRanges] | None = None) -> list[tuple[int, int]]:
+    """Return the VLAN ranges that are free on every port, as the complement of the union of the used VLANs.
+
+    When reserved is given only the VLANs that are reserved on every port can be free. The VLANs are combined as
+    bitsets, so the cost depends on the number of ranges instead of the number of VLANs.
+    """
+    free = FREE_VLANS
+    for vlans in used:
+        free -= _vlan_bitset(vlans)
+    for vlans in reserved if reserved is not None else ():
+        free &= _vlan_bitset(vlans)
+    return list(free.ranges())
+
+
+def find_free_vlans(
+    subscription_ids: Iterable[UUID | UUIDstr],
+    *,
+    product_type: str | None = None,
+    reserved_by_product_type: str | None = None,
+) -> list[tuple[int, int]]:
+    """Find the VLAN ranges that are free on all given ports.
+
+    Args:
+        subscription_ids: The port subscription ids.
+        product_type: Only consider VLANs used by this product type as used, instead of the VLANs of all SAPs.
+        reserved_by_product_type: Only consider VLANs reserved by this product type on every port as free.
+    """
+    subscription_ids = list(subscription_ids)
+    if product_type:
+        used_by_port = find_allocated_vlans_for_product_by_port(subscription_ids, product_type)
+    else:
+        used_by_port = find_allocated_vlans_by_port(subscription_ids)
+    reserved = None
+    if reserved_by_product_type:
+        reserved = find_allocated_vlans_for_product_by_port(subscription_ids, reserved_by_product_type).values()
+    return free_vlan_ranges(used_by_port.values(), reserved)
+
+
+def lowest_free_vlans(free_vlans: list[tuple[int, int]], count: int = 1) -> VlanRanges:
+    """Return the count lowest VLANs of free_vlans, or less if there are not enough free VLANs."""
+    ranges = []
+    for start, end in free_vlans:
+        if count <= 0:
+            break
+        end = min(end, start + count - 1)
+        ranges.append(f"{start}-{end}")
+        count -= end - start + 1
+    return VlanRanges(",".join(ranges))
+
+
+def largest_free_vlan_block(free_vlans: list[tuple[int, int]]) -> VlanRanges:
+    """Return the largest contiguous range of free_vlans, the lowest one if there are several."""
+    if not free_vlans:
+        return VlanRanges([])
+    start, end = max(free_vlans, key=lambda vlans: vlans[1] - vlans[0])
+    return VlanRanges(f"{start}-{end}")
 
 
 def _get_subscription(subscription_id: UUID | UUIDstr) -> SubscriptionTable:
-    return db.session.scalar(select(SubscriptionTable).where(SubscriptionTable.subscription_id == subscription_id))
+    def get_subscription() -> SubscriptionTable:
+        return db.session.scalar(select(SubscriptionTable).where(SubscriptionTable.subscription_id == subscription_id))
+
+    if (memo := _lookups.get()) is None:
+        return get_subscription()
+    key = ("subscription", str(subscription_id))
+    if key not in memo:
+        memo[key] = get_subscription()
+    return memo[key]
 
 
 def validate_vlan_reserved_by_product(
@@ -332,9 +526,10 @@ def validate_vlan_reserved_by_product(
         return vlan
 
     logger.info("validation info data", data=info.data)
+    reserved_vlans_by_port = find_allocated_vlans_for_product_by_port(subscription_ids, product_type)
     for subscription_id in subscription_ids:
-        reserved_vlans = find_allocated_vlans_for_product(subscription_id, product_type)
-        if not _vlan_completely_in_vlan_range(vlan, reserved_vlans):
+        reserved_vlans = reserved_vlans_by_port[str(subscription_id)]
+        if not _vlan_completely_in_vlan_range(vlan, _vlan_bitset(reserved_vlans)):
             sub = _get_subscription(subscription_id)
             raise ValueError(
                 f"VLAN(s) {vlan} not reserved by {product_type} on {sub.description}. Available vlans: {reserved_vlans}"
@@ -355,9 +550,9 @@ def validate_vlan_not_used_by_product(
     if not (subscription_ids := _get_subscription_ids_from_info(info, port_field_name)):
         return vlan
 
-    used_vlans = VlanRanges([])
-    for subscription_id in subscription_ids:
-        used_vlans |= find_allocated_vlans_for_product(subscription_id, product_type)
+    used_vlans = VlanBitset()
+    for allocated_vlans in find_allocated_vlans_for_product_by_port(subscription_ids, product_type).values():
+        used_vlans |= _vlan_bitset(allocated_vlans)
 
     if current:
         for subscription_id in subscription_ids:
@@ -366,8 +561,7 @@ def validate_vlan_not_used_by_product(
             for current_selected_vlan in current_selected_vlans:
                 if not current_selected_vlan:
                     current_selected_vlan = "0"
-                current_selected_vlan_range = VlanRanges(current_selected_vlan)
-                used_vlans -= current_selected_vlan_range  # type: ignore[assignment]
+                used_vlans -= _vlan_bitset(VlanRanges(current_selected_vlan))
 
     if _vlan_partially_in_vlan_range(vlan, used_vlans):
         raise ValueError(f"VLAN(s) {vlan} already in use by {product_type}. Used vlans: {used_vlans}")
@@ -404,7 +598,8 @@ def create_saps_in_netbox(
         vlan_group_payload = build_sap_vlan_group_payload(sap, subscription)
         sap.ims_id = netbox.create(vlan_group_payload)  # Required for building vlan_payload
         vlan_payload = build_payload(sap, subscription)
-        netbox.create(vlan_payload)
+        if vlan_payload.vlans:  # the VLANs of compact SAPs are materialised when they are used
+            netbox.create(vlan_payload)
         return vlan_group_payload, vlan_payload
 
     return [create_sap(i) for i in saps]
@@ -432,15 +627,9 @@ def create_l2vpn_terminations_in_netbox(vc: VirtualCircuitBlockProvisioning) ->
     """Provision L2VPN terminations for the Virtual Circuit in Netbox and return the L2vpnTermination payloads."""
     l2vpn = netbox.get_l2vpn(id=vc.ims_id)
 
-    def create_sap_payloads() -> Iterator[netbox.L2vpnTerminationPayload]:
-        for sap in vc.saps:
-            vlans = netbox.get_vlans(group_id=sap.ims_id)
-            for vlan in vlans:
-                yield netbox.L2vpnTerminationPayload(l2vpn=l2vpn.id, assigned_object_id=vlan.id)
-
-    payloads = list(create_sap_payloads())
-    for payload in payloads:
-        netbox.create(payload)
+    vlans = netbox.materialise_vlans([sap.ims_id for sap in vc.saps])
+    payloads = [netbox.L2vpnTerminationPayload(l2vpn=l2vpn.id, assigned_object_id=vlan.id) for vlan in vlans]
+    netbox.bulk_create(payloads)
 
     return payloads
 
@@ -455,8 +644,7 @@ def remove_saps_in_netbox(saps: list[SAPBlock]) -> None:
     """Deprovision the SAPs in Netbox."""
     for sap in saps:
         vlans = netbox.get_vlans(group_id=sap.ims_id)
-        for vlan in vlans:
-            netbox.delete_vlan(id=vlan.id)
+        netbox.delete_vlans([vlan.id for vlan in vlans])
         netbox.delete_vlan_group(id=sap.ims_id)
 
 
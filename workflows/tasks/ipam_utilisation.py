@@ -0,0 +1,45 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import structlog
+from orchestrator.core.workflow import StepList, done, init, step
+from orchestrator.core.workflows.utils import task
+
+from pydantic_forms.types import State
+from services import ipam
+from settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+@step("Compute IPAM utilisation")
+def compute_ipam_utilisation() -> State:
+    prefixes = [
+        settings.IPv4_LOOPBACK_PREFIX,
+        settings.IPv6_LOOPBACK_PREFIX,
+        settings.IPv4_CORE_LINK_PREFIX,
+        settings.IPv6_CORE_LINK_PREFIX,
+    ]
+    ipam_utilisation = [ipam.prefix_utilisation(prefix, settings.IPAM_FORECAST_WINDOW_DAYS) for prefix in prefixes]
+    for utilisation in ipam_utilisation:
+        days_to_exhaustion = utilisation["days_to_exhaustion"]
+        if days_to_exhaustion is not None and days_to_exhaustion < settings.IPAM_EXHAUSTION_WARNING_DAYS:
+            logger.warning("IP prefix running out of space", **utilisation)
+
+    return {"ipam_utilisation": ipam_utilisation}
+
+
+@task()
+def task_ipam_utilisation() -> StepList:
+    return init >> compute_ipam_utilisation >> done
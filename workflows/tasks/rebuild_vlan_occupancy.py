@@ -0,0 +1,42 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import structlog
+from orchestrator.core.db import db
+from orchestrator.core.workflow import StepList, done, init, step
+from orchestrator.core.workflows.utils import task
+from sqlalchemy import func, select
+
+from db.models import PortVlanOccupancyTable
+from pydantic_forms.types import State
+from workflows.shared import sync_vlan_occupancy
+
+logger = structlog.get_logger(__name__)
+
+
+@step("Rebuild port VLAN occupancy")
+def rebuild_vlan_occupancy() -> State:
+    previous_ranges = db.session.scalar(select(func.count()).select_from(PortVlanOccupancyTable))
+    vlan_occupancy_ranges = sync_vlan_occupancy()
+    if previous_ranges != vlan_occupancy_ranges:
+        logger.warning(
+            "Port VLAN occupancy was out of sync", previous_ranges=previous_ranges, ranges=vlan_occupancy_ranges
+        )
+
+    return {"previous_vlan_occupancy_ranges": previous_ranges, "vlan_occupancy_ranges": vlan_occupancy_ranges}
+
+
+@task()
+def task_rebuild_vlan_occupancy() -> StepList:
+    return init >> rebuild_vlan_occupancy >> done
@@ -0,0 +1,165 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import UTC, datetime, timedelta
+from ipaddress import ip_network
+from typing import Annotated
+
+import structlog
+from annotated_types import Ge
+from orchestrator.core.db import (
+    ResourceTypeTable,
+    SubscriptionInstanceTable,
+    SubscriptionInstanceValueTable,
+    SubscriptionTable,
+    db,
+)
+from orchestrator.core.forms import FormPage
+from orchestrator.core.types import SubscriptionLifecycle
+from orchestrator.core.workflow import StepList, conditional, done, init, step
+from orchestrator.core.workflows.utils import task
+from pydantic import ConfigDict
+from sqlalchemy import select
+
+from pydantic_forms.types import FormGenerator, State
+from services import netbox
+from services.ipam import PREFIX_POOL_DESCRIPTION
+from settings import settings
+
+logger = structlog.get_logger(__name__)
+
+IP_ADDRESS_RESOURCE_TYPES = ["ipv4_ipam_id", "ipv6_ipam_id"]
+PREFIX_RESOURCE_TYPES = ["ipv6_prefix_ipam_id"]
+
+
+def initial_input_form_generator() -> FormGenerator:
+    class ReclaimIpamForm(FormPage):
+        model_config = ConfigDict(title="Reclaim orphaned IPAM objects")
+
+        dry_run: bool = True
+        grace_period_hours: Annotated[int, Ge(0)] = 24
+        include_pool_reservations: bool = False
+        pool_reservation_grace_period_hours: Annotated[int, Ge(1)] = 7 * 24
+
+    user_input = yield ReclaimIpamForm
+    return user_input.model_dump()
+
+
+def find_referenced_ipam_ids(resource_types: list[str]) -> set[int]:
+    """Return the NetBox ids in resource_types that are used by a subscription that is not terminated."""
+    value_table = SubscriptionInstanceValueTable
+    query = (
+        select(value_table.value)
+        .join(ResourceTypeTable, value_table.resource_type_id == ResourceTypeTable.resource_type_id)
+        .join(
+            SubscriptionInstanceTable,
+            value_table.subscription_instance_id == SubscriptionInstanceTable.subscription_instance_id,
+        )
+        .join(SubscriptionTable, SubscriptionInstanceTable.subscription_id == SubscriptionTable.subscription_id)
+        .filter(
+            ResourceTypeTable.resource_type.in_(resource_types),
+            SubscriptionTable.status != SubscriptionLifecycle.TERMINATED,
+        )
+        .distinct()
+    )
+    return {int(value) for value in db.session.execute(query).scalars() if value.isdigit()}
+
+
+@step("Find orphaned IPAM objects")
+def find_orphaned_ipam_objects(
+    grace_period_hours: int, include_pool_reservations: bool, pool_reservation_grace_period_hours: int
+) -> State:
+    referenced_ip_address_ids = find_referenced_ipam_ids(IP_ADDRESS_RESOURCE_TYPES)
+    referenced_prefix_ids = find_referenced_ipam_ids(PREFIX_RESOURCE_TYPES)
+    created_before = datetime.now(UTC) - timedelta(hours=grace_period_hours)
+    # the prefix pool of a running worker may still have younger reservations queued
+    reserved_before = datetime.now(UTC) - timedelta(hours=max(grace_period_hours, pool_reservation_grace_period_hours))
+    parents = [
+        settings.IPv4_LOOPBACK_PREFIX,
+        settings.IPv6_LOOPBACK_PREFIX,
+        settings.IPv4_CORE_LINK_PREFIX,
+        settings.IPv6_CORE_LINK_PREFIX,
+    ]
+
+    def is_pool_reservation(prefix) -> bool:
+        status = getattr(prefix.status, "value", prefix.status)
+        return status == "reserved" and prefix.description == PREFIX_POOL_DESCRIPTION
+
+    def is_orphaned_ip_address(address) -> bool:
+        return address.id not in referenced_ip_address_ids and datetime.fromisoformat(address.created) < created_before
+
+    def is_orphaned_prefix(prefix) -> bool:
+        if prefix.id in referenced_prefix_ids:
+            return False
+        if is_pool_reservation(prefix):
+            return include_pool_reservations and datetime.fromisoformat(prefix.created) < reserved_before
+        return datetime.fromisoformat(prefix.created) < created_before
+
+    # the parents may overlap, so the objects are collected by id to list every object only once
+    ip_addresses = {
+        address.id: address
+        for parent in parents
+        for address in netbox.iter_objects(
+            netbox.api.ipam.ip_addresses, parent=parent, fields="id,address,description,created"
+        )
+    }
+    prefixes = {
+        prefix.id: prefix
+        for parent in parents
+        for prefix in netbox.iter_objects(
+            netbox.api.ipam.prefixes, within=parent, fields="id,prefix,status,description,created"
+        )
+    }
+    parent_networks = [ip_network(parent) for parent in parents]
+
+    def is_child_prefix(prefix) -> bool:
+        """Never select a configured parent, nor a prefix outside of them should NetBox ignore the filter."""
+        network = ip_network(prefix.prefix)
+        if network in parent_networks:
+            return False
+        return any(network.version == parent.version and network.subnet_of(parent) for parent in parent_networks)
+
+    orphaned_ip_addresses = [
+        {"id": address.id, "address": str(address.address), "description": address.description}
+        for address in ip_addresses.values()
+        if is_orphaned_ip_address(address)
+    ]
+    orphaned_prefixes = [
+        {"id": prefix.id, "prefix": str(prefix.prefix), "description": prefix.description}
+        for prefix in prefixes.values()
+        if is_child_prefix(prefix) and is_orphaned_prefix(prefix)
+    ]
+    logger.info(
+        "Found orphaned IPAM objects",
+        referenced_ip_addresses=len(referenced_ip_address_ids),
+        referenced_prefixes=len(referenced_prefix_ids),
+        ip_addresses=len(orphaned_ip_addresses),
+        prefixes=len(orphaned_prefixes),
+    )
+
+    return {"orphaned_ip_addresses": orphaned_ip_addresses, "orphaned_prefixes": orphaned_prefixes}
+
+
+@step("Delete orphaned IPAM objects")
+def delete_orphaned_ipam_objects(orphaned_ip_addresses: list[dict], orphaned_prefixes: list[dict]) -> State:
+    netbox.bulk_delete(netbox.api.ipam.ip_addresses, [address["id"] for address in orphaned_ip_addresses])
+    netbox.bulk_delete(netbox.api.ipam.prefixes, [prefix["id"] for prefix in orphaned_prefixes])
+
+    return {"deleted_ip_addresses": len(orphaned_ip_addresses), "deleted_prefixes": len(orphaned_prefixes)}
+
+
+unless_dry_run = conditional(lambda state: not state.get("dry_run", True))
+
+
+@task(initial_input_form=initial_input_form_generator)
+def task_reclaim_ipam() -> StepList:
+    return init >> find_orphaned_ipam_objects >> unless_dry_run(delete_orphaned_ipam_objects) >> done
@@ -0,0 +1,141 @@
+# Copyright 2019-2026 SURF.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import heapq
+from collections.abc import Iterable, Iterator
+from itertools import groupby
+from operator import itemgetter
+from uuid import UUID
+
+import structlog
+from orchestrator.core.db import (
+    ProductTable,
+    ResourceTypeTable,
+    SubscriptionInstanceRelationTable,
+    SubscriptionInstanceTable,
+    SubscriptionInstanceValueTable,
+    SubscriptionTable,
+    db,
+)
+from orchestrator.core.types import SubscriptionLifecycle
+from orchestrator.core.workflow import StepList, done, init, step
+from orchestrator.core.workflows.utils import task
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from pydantic_forms.types import State
+from utils.vlans import VlanBitset
+
+logger = structlog.get_logger(__name__)
+
+# VLANs of NSIP2P SAPs are taken from the VLANs that an NSISTP reserved on the same port
+ALLOWED_OVERLAPS = {frozenset({"Nsistp", "Nsip2p"})}
+
+SAP_ROWS_PER_FETCH = 1000
+
+# (subscription id, product type, first vlan, last vlan)
+Vlans = tuple[UUID, str, int, int]
+
+
+def sap_vlans_by_port() -> Iterator[tuple[UUID, list[Vlans]]]:
+    """Stream the VLAN ranges of the SAPs of all subscriptions that are not terminated, grouped by port."""
+    port_si = aliased(SubscriptionInstanceTable)
+    sap_si = aliased(SubscriptionInstanceTable)
+    query = (
+        select(
+            port_si.subscription_id,
+            sap_si.subscription_id,
+            ProductTable.product_type,
+            SubscriptionInstanceValueTable.value,
+        )
+        .join(
+            ResourceTypeTable,
+            SubscriptionInstanceValueTable.resource_type_id == ResourceTypeTable.resource_type_id,
+        )
+        .join(sap_si, SubscriptionInstanceValueTable.subscription_instance_id == sap_si.subscription_instance_id)
+        .join(SubscriptionTable, sap_si.subscription_id == SubscriptionTable.subscription_id)
+        .join(ProductTable, SubscriptionTable.product_id == ProductTable.product_id)
+        .join(
+            SubscriptionInstanceRelationTable,
+            sap_si.subscription_instance_id == SubscriptionInstanceRelationTable.in_use_by_id,
+        )
+        .join(port_si, SubscriptionInstanceRelationTable.depends_on_id == port_si.subscription_instance_id)
+        .filter(
+            ResourceTypeTable.resource_type == "vlan",
+            SubscriptionTable.status != SubscriptionLifecycle.TERMINATED,
+        )
+        .order_by(port_si.subscription_id)
+        .execution_options(yield_per=SAP_ROWS_PER_FETCH)
+    )
+    for port_subscription_id, rows in groupby(db.session.execute(query), key=itemgetter(0)):
+        vlans = [
+            (subscription_id, product_type, start, end)
+            for _, subscription_id, product_type, value in rows
+            for start, end in VlanBitset.from_string(value).ranges()
+        ]
+        yield port_subscription_id, vlans
+
+
+def overlapping_vlans(vlans: Iterable[Vlans]) -> Iterator[tuple[Vlans, Vlans, int, int]]:
+    """Sweep the VLAN ranges of one port in order of their first VLAN and yield every pair of overlapping ranges.
+
+    The ranges that are still open are kept in a heap on their last VLAN, so ranges that ended are dropped as soon as
+    the sweep passes them and every range is only compared with the ranges it overlaps.
+    """
+    active: list[tuple[int, int, Vlans]] = []
+    for i, current in enumerate(sorted(vlans, key=itemgetter(2))):
+        _, _, start, end = current
+        while active and active[0][0] < start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            yield other, current, start, min(end, other[3])
+        heapq.heappush(active, (end, i, current))
+
+
+def find_vlan_conflicts(port_subscription_id: UUID, vlans: list[Vlans]) -> list[dict]:
+    """Return the pairs of subscriptions that use the same VLANs on a port, with the VLANs they share."""
+    shared: dict[tuple[UUID, UUID], VlanBitset] = {}
+    for (subscription_a, product_a, _, _), (subscription_b, product_b, _, _), start, end in overlapping_vlans(vlans):
+        if subscription_a == subscription_b or frozenset({product_a, product_b}) in ALLOWED_OVERLAPS:
+            continue
+        pair = min(subscription_a, subscription_b), max(subscription_a, subscription_b)
+        shared[pair] = shared.get(pair, VlanBitset()) | VlanBitset.from_ranges([(start, end)])
+
+    return [
+        {
+            "port_subscription_id": str(port_subscription_id),
+            "subscription_ids": [str(subscription_a), str(subscription_b)],
+            "vlans": str(shared_vlans),
+        }
+        for (subscription_a, subscription_b), shared_vlans in shared.items()
+    ]
+
+
+@step("Scan VLAN conflicts")
+def scan_vlan_conflicts() -> State:
+    vlan_conflicts = []
+    ports = vlan_ranges = 0
+    for port_subscription_id, vlans in sap_vlans_by_port():
+        ports += 1
+        vlan_ranges += len(vlans)
+        for conflict in find_vlan_conflicts(port_subscription_id, vlans):
+            logger.warning("VLAN conflict", **conflict)
+            vlan_conflicts.append(conflict)
+
+    return {"ports_scanned": ports, "vlan_ranges_scanned": vlan_ranges, "vlan_conflicts": vlan_conflicts}
+
+
+@task()
+def task_scan_vlan_conflicts() -> StepList:
+    return init >> scan_vlan_conflicts >> done
@@ -63,7 +63,7 @@ def initial_input_form_generator() -> FormGenerator:
 def wipe_all_objects() -> State:
     objects_deleted = []
     for endpoint in endpoints:
-        for object in endpoint.all():
+        for object in netbox.iter_objects(endpoint, prefetch=True):
             object.delete()
             logger.info("delete object from Netbox", object=object, endpoint=object.endpoint.name)
             objects_deleted.append({"object": str(object), "endpoint": object.endpoint.name})
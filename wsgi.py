@@ -14,14 +14,17 @@
 
 from orchestrator.core import OrchestratorCore
 from orchestrator.core.settings import AppSettings
+from prometheus_client import make_asgi_app
 
 import db  # noqa: F401  Side-effects: registers CustomerTable with ALL_DB_MODELS
 import products  # noqa: F401  Side-effects
 import workflows  # noqa: F401  Side-effects
 from graphql_utils import CUSTOM_GRAPHQL_MODELS, custom_subscription_interface
+from services import netbox_metrics
 
 app = OrchestratorCore(base_settings=AppSettings())
 app.register_graphql(
     subscription_interface=custom_subscription_interface,
     graphql_models=CUSTOM_GRAPHQL_MODELS,
 )
+app.mount("/api/netbox/metrics", make_asgi_app(registry=netbox_metrics.registry))